@@ -0,0 +1,116 @@
+import copy
+import heapq
+import itertools
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+# Most-recent entries kept in the heap; the dashboard shows a handful
+RECENT_CAPACITY = 32
+# Batches up to this size are folded in row by row, larger ones with groupby
+_ROW_BY_ROW_LIMIT = 16
+
+
+def week_start(day) -> datetime:
+    """Midnight on the Monday of ``day``'s week."""
+    day = datetime(day.year, day.month, day.day)
+    return day - timedelta(days=day.weekday())
+
+
+def month_start(day) -> datetime:
+    """Midnight on the first of ``day``'s month."""
+    return datetime(day.year, day.month, 1)
+
+
+class WasteAggregates:
+    """Running totals over the waste log, updated per entry in O(1).
+
+    Keeps the overall total and count, per-type weight and entry counts,
+    per-day weight overall and per type, per-type weight for each week
+    (keyed by ``week_start``) and month (``month_start``), and a bounded
+    min-heap of the most recent entries, so dashboard figures never need
+    to scan the log.
+    """
+
+    def __init__(self, recent_capacity: int = RECENT_CAPACITY):
+        self.recent_capacity = recent_capacity
+        self.total = 0.0
+        self.count = 0
+        self.by_type: Dict[str, float] = defaultdict(float)
+        self.count_by_type: Dict[str, int] = defaultdict(int)
+        self.by_day: Dict[pd.Timestamp, float] = defaultdict(float)
+        self.by_day_type: Dict[Tuple[pd.Timestamp, str], float] = defaultdict(float)
+        self.by_week_type: Dict[Tuple[datetime, str], float] = defaultdict(float)
+        self.by_month_type: Dict[Tuple[datetime, str], float] = defaultdict(float)
+        self._recent: List[tuple] = []
+        self._seq = itertools.count()
+        # Store version a copy reflects; see WasteStore.aggregates_snapshot
+        self.version = None
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, **kwargs) -> "WasteAggregates":
+        aggregates = cls(**kwargs)
+        aggregates.add_frame(frame)
+        return aggregates
+
+    def copy(self) -> "WasteAggregates":
+        """An independent copy that later adds leave unchanged."""
+        clone = copy.copy(self)
+        for name in ("by_type", "count_by_type", "by_day", "by_day_type", "by_week_type", "by_month_type"):
+            setattr(clone, name, getattr(self, name).copy())
+        clone._recent = list(self._recent)
+        return clone
+
+    def add(self, entry: Dict[str, Any]):
+        day = pd.Timestamp(entry["date"]).normalize()
+        weight = float(entry["weight"])
+        self.total += weight
+        self.count += 1
+        self.by_type[entry["type"]] += weight
+        self.count_by_type[entry["type"]] += 1
+        self.by_day[day] += weight
+        self.by_day_type[day, entry["type"]] += weight
+        self.by_week_type[week_start(day), entry["type"]] += weight
+        self.by_month_type[month_start(day), entry["type"]] += weight
+        self._push_recent(day, entry)
+
+    def add_frame(self, frame: pd.DataFrame):
+        if len(frame) <= _ROW_BY_ROW_LIMIT:
+            for entry in frame.to_dict("records"):
+                self.add(entry)
+            return
+        weights = frame["weight"]
+        self.total += float(weights.sum())
+        self.count += len(frame)
+        grouped = weights.groupby(frame["type"], observed=True)
+        for waste_type, weight in grouped.sum().items():
+            self.by_type[waste_type] += float(weight)
+        for waste_type, count in grouped.size().items():
+            self.count_by_type[waste_type] += int(count)
+        days = pd.to_datetime(frame["date"]).dt.normalize()
+        by_day_type = weights.groupby([days, frame["type"]], observed=True).sum()
+        for (day, waste_type), weight in by_day_type.items():
+            self.by_day[day] += float(weight)
+            self.by_day_type[day, waste_type] += float(weight)
+            self.by_week_type[week_start(day), waste_type] += float(weight)
+            self.by_month_type[month_start(day), waste_type] += float(weight)
+        latest = frame.nlargest(self.recent_capacity, "date")
+        for entry in latest.iloc[::-1].to_dict("records"):
+            self._push_recent(pd.Timestamp(entry["date"]).normalize(), entry)
+
+    def _push_recent(self, day: pd.Timestamp, entry: Dict[str, Any]):
+        item = (day, next(self._seq), entry)
+        if len(self._recent) < self.recent_capacity:
+            heapq.heappush(self._recent, item)
+        else:
+            heapq.heappushpop(self._recent, item)
+
+    def recent(self, n: int) -> List[Dict[str, Any]]:
+        return [entry for _, _, entry in heapq.nlargest(n, self._recent)]
+
+    def most_common_type(self):
+        if not self.count_by_type:
+            return None
+        return max(self.count_by_type, key=self.count_by_type.get)
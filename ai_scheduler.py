@@ -0,0 +1,296 @@
+import functools
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# HTTP statuses worth retrying: quota (429) and transient server errors
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """google.api_core errors carry the HTTP status in ``code``."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        return int(getattr(error, "code", 0) or 0) in RETRYABLE_CODES
+    except (TypeError, ValueError):
+        return False
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second on average, in bursts of up
+    to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class SharedStream:
+    """One upstream stream read by any number of subscribers.
+
+    Chunks are appended to a list shared by every subscriber, and each
+    subscriber replays it from the start. Whichever subscriber runs out of
+    chunks first pulls the next one from upstream, so a subscriber that
+    stops reading never stalls the others. Once the last subscriber leaves
+    an unfinished stream, the upstream is closed and the stream accepts no
+    new subscribers. ``on_close(stream)`` is called once the stream is finished or
+    closed.
+    """
+
+    def __init__(self, upstream: Iterator, on_close: Optional[Callable[["SharedStream"], None]] = None):
+        self.chunks: List[Any] = []
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.closed = False
+        self._upstream = upstream
+        self._on_close = on_close
+        self._subscribers = 0
+        self._pulling = False
+        self._cond = threading.Condition()
+
+    def join(self) -> bool:
+        """Counts a new subscriber; False once the stream was abandoned."""
+        with self._cond:
+            if self.closed:
+                return False
+            self._subscribers += 1
+            return True
+
+    def read(self) -> Iterator:
+        """The subscriber's iterator; call ``join`` first."""
+        index = 0
+        try:
+            while True:
+                with self._cond:
+                    while index == len(self.chunks) and not self.done and self._pulling:
+                        self._cond.wait()
+                    pull = False
+                    if index < len(self.chunks):
+                        chunk = self.chunks[index]
+                    elif self.done:
+                        if self.error is not None:
+                            raise self.error
+                        return
+                    else:
+                        self._pulling = pull = True
+                if pull:
+                    self._pull()
+                    continue
+                index += 1
+                yield chunk
+        finally:
+            self._leave()
+
+    def _pull(self):
+        chunk, done, error = None, False, None
+        try:
+            chunk = next(self._upstream)
+        except StopIteration:
+            done = True
+        except Exception as e:
+            done, error = True, e
+        finally:
+            with self._cond:
+                if done:
+                    self.done, self.error = True, error
+                else:
+                    self.chunks.append(chunk)
+                self._pulling = False
+                self._cond.notify_all()
+        if done:
+            self._finish()
+
+    def _leave(self):
+        with self._cond:
+            self._subscribers -= 1
+            abandoned = self._subscribers == 0 and not self.done and not self.closed
+            if abandoned:
+                self.closed = True
+        if abandoned:
+            self._upstream.close()
+            self._finish()
+
+    def _finish(self):
+        with self._cond:
+            self.closed = True
+            on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close(self)
+
+
+class RequestScheduler:
+    """Runs model calls on a bounded thread pool with rate limiting.
+
+    - at most ``max_concurrency`` calls are in flight per process;
+    - a token bucket admits ``requests_per_minute`` calls, bursting to ``burst``;
+    - retryable errors (see ``is_retryable``) are retried up to
+      ``max_retries`` times with full-jitter exponential backoff;
+    - each call waits at most ``timeout_seconds`` for its result;
+    - identical plain-text prompts already in flight share one upstream call;
+      a streamed one is replayed to every caller as its chunks arrive.
+
+    It exposes ``generate_content`` like the model it wraps, so it can sit
+    behind the response cache unchanged.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_concurrency: int = 4,
+        requests_per_minute: float = 60,
+        burst: int = 10,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        timeout_seconds: float = 60.0,
+    ):
+        self.model = model
+        self.model_name = getattr(model, "model_name", type(model).__name__)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout_seconds = timeout_seconds
+        self._bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+        self._inflight: Dict[Any, Future] = {}
+        self._streams: Dict[str, SharedStream] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "coalesced": 0, "retries": 0, "failures": 0, "timeouts": 0}
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _retry(self, attempt: int, error: Exception) -> bool:
+        """Waits out the backoff and returns True if ``error`` is worth
+        another attempt; otherwise counts the failure."""
+        if attempt >= self.max_retries or not is_retryable(error):
+            self._count("failures")
+            return False
+        self._count("retries")
+        time.sleep(self._backoff(attempt))
+        return True
+
+    def _call(self, prompt, **kwargs):
+        kwargs.setdefault("request_options", {"timeout": self.timeout_seconds})
+        attempt = 0
+        while True:
+            self._bucket.acquire()
+            try:
+                return self.model.generate_content(prompt, **kwargs)
+            except Exception as e:
+                if not self._retry(attempt, e):
+                    raise
+                attempt += 1
+
+    def _run(self, prompt, **kwargs):
+        with self._slots:
+            return self._call(prompt, **kwargs)
+
+    def _forget(self, key, future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def submit(self, prompt, **kwargs) -> Future:
+        """Queues a non-streaming call and returns its Future."""
+        key = prompt if isinstance(prompt, str) and not kwargs else None
+        with self._lock:
+            self.stats["requests"] += 1
+            if key is not None and key in self._inflight:
+                self.stats["coalesced"] += 1
+                return self._inflight[key]
+            future = self._pool.submit(self._run, prompt, **kwargs)
+            if key is not None:
+                self._inflight[key] = future
+        if key is not None:
+            future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        if stream:
+            return self._subscribe(prompt, **kwargs)
+        try:
+            return self.submit(prompt, **kwargs).result(timeout=self.timeout_seconds)
+        except FutureTimeout:
+            self._count("timeouts")
+            raise TimeoutError(f"Model call timed out after {self.timeout_seconds:g}s") from None
+
+    def _subscribe(self, prompt, **kwargs) -> Iterator:
+        key = prompt if isinstance(prompt, str) and not kwargs else None
+        with self._lock:
+            self.stats["requests"] += 1
+            stream = self._streams.get(key) if key is not None else None
+            if stream is not None and stream.join():
+                self.stats["coalesced"] += 1
+            else:
+                on_close = functools.partial(self._forget_stream, key) if key is not None else None
+                stream = SharedStream(self._stream(prompt, **kwargs), on_close)
+                stream.join()
+                if key is not None:
+                    self._streams[key] = stream
+        return stream.read()
+
+    def _forget_stream(self, key, stream: SharedStream):
+        with self._lock:
+            if self._streams.get(key) is stream:
+                del self._streams[key]
+
+    def _stream(self, prompt, **kwargs):
+        # Streams are consumed by the calling threads, so they take a
+        # concurrency slot directly instead of going through the pool
+        if not self._slots.acquire(timeout=self.timeout_seconds):
+            self._count("timeouts")
+            raise TimeoutError("No free model slot for streaming request")
+        try:
+            kwargs.setdefault("request_options", {"timeout": self.timeout_seconds})
+            attempt = 0
+            while True:
+                self._bucket.acquire()
+                started = False
+                try:
+                    for chunk in self.model.generate_content(prompt, stream=True, **kwargs):
+                        started = True
+                        yield chunk
+                    return
+                except Exception as e:
+                    # Once a chunk is out, a retry would repeat it
+                    if started:
+                        self._count("failures")
+                        raise
+                    if not self._retry(attempt, e):
+                        raise
+                    attempt += 1
+        finally:
+            self._slots.release()
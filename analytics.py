@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from aggregates import WasteAggregates
+from waste_store import WASTE_TYPES
+
+
+@dataclass(frozen=True)
+class Granularity:
+    freq: str           # pandas offset alias; periods are labelled by their last day
+    rolling_window: int  # periods in the rolling average
+    horizon: int         # periods forecast ahead
+
+
+GRANULARITIES = {
+    "Daily": Granularity("D", rolling_window=7, horizon=14),
+    "Weekly": Granularity("W", rolling_window=4, horizon=8),
+    "Monthly": Granularity("ME", rolling_window=3, horizon=3),
+}
+# Holt's linear smoothing weights for the level and the trend
+ALPHA = 0.3
+BETA = 0.1
+
+
+def daily_by_type(totals: WasteAggregates) -> pd.DataFrame:
+    """Weight per day (rows, no gaps) and waste type (columns, WASTE_TYPES
+    order), built from the running per-day totals without touching the log."""
+    if not totals.by_day_type:
+        return pd.DataFrame(columns=WASTE_TYPES, dtype="float64")
+    series = pd.Series(totals.by_day_type, dtype="float64")
+    table = series.unstack(fill_value=0.0).reindex(columns=WASTE_TYPES, fill_value=0.0)
+    table = table.sort_index().asfreq("D", fill_value=0.0)
+    return table.rename_axis("date").rename_axis(None, axis=1)
+
+
+def resample(daily: pd.DataFrame, freq: str) -> pd.DataFrame:
+    if freq == "D" or daily.empty:
+        return daily
+    return daily.resample(freq).sum()
+
+
+def rolling_average(table: pd.DataFrame, window: int) -> pd.DataFrame:
+    return table.rolling(window, min_periods=1).mean()
+
+
+def holt(values: np.ndarray, alpha: float = ALPHA, beta: float = BETA,
+         levels: Optional[np.ndarray] = None, trends: Optional[np.ndarray] = None, start: int = 0):
+    """Holt's linear exponential smoothing over the rows of ``values``,
+    one column per series.
+
+    Returns per-row ``levels`` and ``trends``. Passing the arrays from an
+    earlier call with ``start`` set to the first changed row re-smooths
+    only the rows from there on.
+    """
+    n, k = values.shape
+    new_levels = np.empty((n, k))
+    new_trends = np.empty((n, k))
+    if start > 0:
+        new_levels[:start] = levels[:start]
+        new_trends[:start] = trends[:start]
+    else:
+        new_levels[0] = values[0]
+        new_trends[0] = 0.0
+        start = 1
+    for t in range(start, n):
+        level = alpha * values[t] + (1 - alpha) * (new_levels[t - 1] + new_trends[t - 1])
+        new_trends[t] = beta * (level - new_levels[t - 1]) + (1 - beta) * new_trends[t - 1]
+        new_levels[t] = level
+    return new_levels, new_trends
+
+
+def _first_change(old: Optional[pd.DataFrame], new: pd.DataFrame) -> int:
+    if old is None or len(old) == 0 or len(new) == 0 or old.index[0] != new.index[0]:
+        return 0
+    overlap = min(len(old), len(new))
+    changed = ~np.isclose(old.to_numpy()[:overlap], new.to_numpy()[:overlap]).all(axis=1)
+    return int(np.argmax(changed)) if changed.any() else overlap
+
+
+class TrendSeries:
+    """Resampled history, rolling average and forecast at one granularity.
+
+    Only complete periods are smoothed (the running week or month would
+    drag the trend down), and the forecast starts with the period after
+    the last complete one.
+    """
+
+    def __init__(self, granularity: Granularity):
+        self.granularity = granularity
+        self.history = pd.DataFrame(columns=WASTE_TYPES, dtype="float64")
+        self.rolling = self.history
+        self.forecast = self.history
+        self._fitted: Optional[pd.DataFrame] = None
+        self._levels = self._trends = None
+        self.resmoothed = 0
+
+    def refresh(self, daily: pd.DataFrame):
+        g = self.granularity
+        self.history = resample(daily, g.freq)
+        self.rolling = rolling_average(self.history, g.rolling_window)
+        complete = self.history[self.history.index <= daily.index[-1]] if len(daily) else self.history
+        if complete.empty:
+            self.forecast = complete
+            self._fitted = None
+            return
+        start = _first_change(self._fitted, complete)
+        self.resmoothed = len(complete) - start
+        if self.resmoothed or len(complete) != len(self._fitted):
+            self._levels, self._trends = holt(complete.to_numpy(), levels=self._levels, trends=self._trends, start=start)
+            self._fitted = complete
+        steps = np.arange(1, g.horizon + 1)[:, None]
+        values = np.clip(self._levels[-1] + steps * self._trends[-1], 0.0, None)
+        index = pd.date_range(complete.index[-1], periods=g.horizon + 1, freq=g.freq)[1:]
+        self.forecast = pd.DataFrame(values, index=index, columns=WASTE_TYPES).rename_axis("date")
+
+
+class TrendEngine:
+    """Daily, weekly and monthly series per waste type with forecasts.
+
+    ``refresh`` is a no-op for a version it has already seen. Otherwise the
+    daily table is rebuilt from the running per-day totals (cost grows
+    with the number of days, not entries) and smoothing restarts at the
+    first period whose totals changed, which for appended entries is
+    usually just the last one or two.
+    """
+
+    def __init__(self, granularities: Dict[str, Granularity] = GRANULARITIES):
+        self.version = None
+        self.daily = pd.DataFrame(columns=WASTE_TYPES, dtype="float64")
+        self.series = {name: TrendSeries(granularity) for name, granularity in granularities.items()}
+
+    def refresh(self, totals: WasteAggregates, version: int) -> "TrendEngine":
+        if version != self.version:
+            self.daily = daily_by_type(totals)
+            for series in self.series.values():
+                series.refresh(self.daily)
+            self.version = version
+        return self
+
+    def __getitem__(self, name: str) -> TrendSeries:
+        return self.series[name]
@@ -0,0 +1,272 @@
+"""Config, shared resources and per-session state used by every page.
+
+Nothing here imports pandas, plotly or google.generativeai at module
+level: the model client and the waste log are built the first time a page
+asks for them through ``current_model`` / ``current_store``.
+"""
+import functools
+import hashlib
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Dict, Any, List, Tuple
+
+import streamlit as st
+
+from instrumentation import METRICS, cache_gauges, model_gauges
+from sites import SiteRegistry
+from state_backend import MAX_STALENESS_SECONDS
+
+CONFIG_FILE = 'Gemini_config.json'
+MODEL_NAME = 'gemini-1.5-flash-exp-0827'
+# Live clients kept at once; each config file revision gets its own slot
+MODEL_POOL_SIZE = 2
+# Chat messages painted per rerun; older ones are behind "Show earlier"
+CHAT_RENDER_WINDOW = 50
+# Chat messages kept per conversation in the state backend; each save
+# past the limit deletes the oldest
+MAX_SAVED_MESSAGES = 500
+# Conversations nobody has saved to for this long are deleted from the
+# state backend, checked at most every PRUNE_INTERVAL_SECONDS per process
+CONVERSATION_TTL_SECONDS = 30 * 24 * 3600
+PRUNE_INTERVAL_SECONDS = 3600
+# Collection of {"chat": conversation id, "saved_at": time} records, one
+# per session that saved to the conversation
+CONVERSATIONS = "conversations"
+
+# File path -> ((mtime, size), sha256, parsed config) of its last read
+_CONFIGS: Dict[str, Tuple[Tuple[int, int], str, Dict[str, Any]]] = {}
+_next_prune = 0.0
+
+def _read_config(file_path: str) -> Tuple[Tuple[int, int], str, Dict[str, Any]]:
+    # Every page, the model pool and the site registry ask for the config
+    # on each rerun; the file is only read and parsed again once it changes
+    stat = os.stat(file_path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIGS.get(file_path)
+    if cached is None or cached[0] != key:
+        with open(file_path, 'rb') as file:
+            data = file.read()
+        cached = _CONFIGS[file_path] = (key, hashlib.sha256(data).hexdigest(), json.loads(data))
+    return cached
+
+def load_config(file_path: str) -> Dict[str, Any]:
+    """The parsed config file. The dict is shared between callers until
+    the file changes, so copy a section before modifying it."""
+    try:
+        return _read_config(file_path)[2]
+    except FileNotFoundError:
+        st.error(f"Error: Config file not found at {file_path}")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        st.error(f"Error: Invalid JSON in config file {file_path}")
+        sys.exit(1)
+
+def setup_gemini(config: Dict[str, Any]):
+    try:
+        import google.generativeai as genai
+        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+
+        genai.configure(api_key=st.secrets["API_KEY"])
+
+        safety_settings = {
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_ONLY_HIGH,
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_ONLY_HIGH,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_ONLY_HIGH,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_ONLY_HIGH,
+        }
+
+        system_prompt = """You are a Waste Management AI Assistant specialized in:
+        1. Identifying and categorizing waste materials
+        2. Providing recycling and disposal guidelines
+        3. Suggesting waste reduction strategies
+        4. Explaining environmental impact
+        5. Recommending sustainable alternatives
+        Please provide specific, actionable advice while maintaining environmental consciousness."""
+
+        return genai.GenerativeModel(
+            MODEL_NAME,
+            system_instruction=system_prompt,
+            generation_config=config['generation_config'],
+            safety_settings=safety_settings,
+        )
+    except Exception as e:
+        st.error(f"Error setting up Gemini: {str(e)}")
+        sys.exit(1)
+
+@st.cache_resource
+def get_response_cache(max_entries: int = 512, ttl_seconds=None, path=None):
+    # Shared by every session so a question answered once is answered for all
+    from response_cache import ResponseCache
+    return ResponseCache(max_entries=max_entries, ttl_seconds=ttl_seconds, path=path)
+
+@st.cache_resource
+def get_image_cache(max_entries: int = 2048, max_distance: int = 6):
+    # Shared by every session: a photo identified once is known to all
+    from image_classify import ImageHashCache
+    cache = ImageHashCache(max_entries=max_entries, max_distance=max_distance)
+    METRICS.register_collector("image_cache", functools.partial(cache_gauges, cache, "image"))
+    return cache
+
+def config_digest(file_path: str) -> str:
+    try:
+        return _read_config(file_path)[1]
+    except FileNotFoundError:
+        return ""
+    except json.JSONDecodeError:
+        load_config(file_path)  # reports the invalid JSON and stops
+
+def has_api_key() -> bool:
+    try:
+        return bool(st.secrets.get("API_KEY"))
+    except Exception:  # no secrets.toml at all
+        return False
+
+@st.cache_resource(max_entries=MODEL_POOL_SIZE, show_spinner=False)
+def get_shared_model(file_path: str, digest: str):
+    # ``digest`` is only part of the cache key: editing the config file
+    # changes it, so the next session builds a fresh client
+    from local_classifier import LocalFirstModel
+    if not has_api_key():
+        return LocalFirstModel(None)
+    from ai_scheduler import RequestScheduler
+    from response_cache import CachedModel
+    from semantic_cache import SemanticCache, SemanticCachedModel
+
+    config = load_config(file_path)
+    cache = get_response_cache(**config.get('response_cache', {}))
+    # Cache hits return before the scheduler, so they never spend rate-limit tokens
+    model = RequestScheduler(setup_gemini(config), **config.get('request_scheduler', {}))
+    semantic = dict(config.get('semantic_cache', {}))
+    if semantic.pop('enabled', False):
+        # Only exact-cache misses are looked up; paraphrases of an answered
+        # question are served without a model call
+        model = SemanticCachedModel(model, SemanticCache(**semantic))
+    # Common "where does X go" questions are answered locally before the cache
+    return LocalFirstModel(CachedModel(model, cache, config['generation_config']))
+
+@st.cache_resource
+def get_state_backend(backend: str = "memory", max_staleness_seconds: float = MAX_STALENESS_SECONDS, **options):
+    # One connection per process; ``max_staleness_seconds`` is applied by
+    # the caches in front of it
+    from state_backend import open_state_backend
+    return open_state_backend(backend, **options)
+
+def state_backend():
+    """The deployment's shared state backend, or None to keep state in
+    each process's memory."""
+    return get_state_backend(**load_config(CONFIG_FILE).get('state_backend', {}))
+
+@st.cache_resource
+def get_site_registry(backend: str = "memory", path=None, names=None, default: str = "Main",
+                      locations=None, state_backend=None) -> SiteRegistry:
+    # One registry per process: every session of a site shares its stores,
+    # and with a state backend so do the other processes
+    state_backend = state_backend or {}
+    return SiteRegistry(
+        backend, path, names, default, locations,
+        get_state_backend(**state_backend), state_backend.get('max_staleness_seconds', MAX_STALENESS_SECONDS),
+    )
+
+def site_registry() -> SiteRegistry:
+    config = load_config(CONFIG_FILE)
+    return get_site_registry(
+        **config.get('waste_store', {}), **config.get('sites', {}), state_backend=config.get('state_backend'),
+    )
+
+def current_model():
+    """The session's model, (re)built when missing or the config changed."""
+    digest = config_digest(CONFIG_FILE)
+    if "model" not in st.session_state or st.session_state.get("model_digest", digest) != digest:
+        st.session_state.model = get_shared_model(CONFIG_FILE, digest)
+        st.session_state.model_digest = digest
+        # Cache hit rates on the admin panel follow the newest client
+        METRICS.register_collector("model", functools.partial(model_gauges, st.session_state.model))
+    return st.session_state.model
+
+def current_store():
+    """The waste log of the session's site, opened on first use."""
+    if "waste_store" not in st.session_state:
+        st.session_state.waste_store = site_registry().site(st.session_state.site).waste
+    return st.session_state.waste_store
+
+def conversation_id() -> str:
+    """The chat's id, kept in the URL so a refresh reopens the same
+    conversation whichever process serves it."""
+    if "chat" not in st.query_params:
+        st.query_params["chat"] = uuid.uuid4().hex
+    return st.query_params["chat"]
+
+def load_messages() -> List[Dict[str, Any]]:
+    state = state_backend()
+    if state is None:
+        return []
+    _, records = state.load(f"messages:{conversation_id()}")
+    return [records[message_id] for message_id in sorted(records)[-MAX_SAVED_MESSAGES:]]
+
+def prune_conversations(state, now: float):
+    """Drops the messages of conversations nobody has saved to for
+    CONVERSATION_TTL_SECONDS; the newest record of a conversation decides."""
+    cutoff = now - CONVERSATION_TTL_SECONDS
+    _, records = state.load(CONVERSATIONS)
+    last_saved: Dict[str, float] = {}
+    for record_id, record in records.items():
+        last_saved[record["chat"]] = max(last_saved.get(record["chat"], 0.0), record["saved_at"])
+        if record["saved_at"] < cutoff:
+            state.delete(CONVERSATIONS, record_id)
+    for chat, saved_at in last_saved.items():
+        if saved_at < cutoff:
+            state.drop(f"messages:{chat}")
+
+def save_messages():
+    """Writes the chat messages added since the last save to the state
+    backend, if there is one, keeping the newest MAX_SAVED_MESSAGES."""
+    global _next_prune
+    state = state_backend()
+    messages = st.session_state.messages
+    if state is not None:
+        collection = f"messages:{conversation_id()}"
+        for message in messages[st.session_state.get("messages_saved", 0):]:
+            message_id, _ = state.put(collection, message)
+            # Ids count up from 1, so one delete per save holds the limit
+            if message_id > MAX_SAVED_MESSAGES:
+                state.delete(collection, message_id - MAX_SAVED_MESSAGES)
+        now = time.time()
+        st.session_state.conversation_record, _ = state.put(
+            CONVERSATIONS, {"chat": conversation_id(), "saved_at": now}, st.session_state.get("conversation_record"),
+        )
+        if now >= _next_prune:
+            _next_prune = now + PRUNE_INTERVAL_SECONDS
+            prune_conversations(state, now)
+    st.session_state.messages_saved = len(messages)
+
+def switch_site():
+    st.session_state.pop("waste_store", None)
+    site = site_registry().site(st.session_state.site)
+    st.session_state.schedules = site.schedules
+    st.session_state.goals = site.goals
+
+def initialize_session_state():
+    if "messages" not in st.session_state:
+        st.session_state.messages = load_messages()
+        st.session_state.messages_saved = len(st.session_state.messages)
+    if "page" not in st.session_state:
+        st.session_state.page = "home"
+    if "site" not in st.session_state:
+        st.session_state.site = site_registry().default
+    if "schedules" not in st.session_state:
+        st.session_state.schedules = site_registry().site(st.session_state.site).schedules
+    if "goals" not in st.session_state:
+        st.session_state.goals = site_registry().site(st.session_state.site).goals
+    if "daily_facts" not in st.session_state:
+        st.session_state.daily_facts = []
+    if "daily_tip" not in st.session_state:
+        st.session_state.daily_tip = ""
+    if "stream_responses" not in st.session_state:
+        st.session_state.stream_responses = True
+    if "remember_conversation" not in st.session_state:
+        st.session_state.remember_conversation = True
+    if "chat_render_limit" not in st.session_state:
+        st.session_state.chat_render_limit = CHAT_RENDER_WINDOW
@@ -0,0 +1,102 @@
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from instrumentation import METRICS
+from waste_store import WASTE_TYPES
+
+BATCH_SIZE = 50
+MAX_PARALLEL_BATCHES = 4
+# Per-call override: ask for JSON regardless of the configured mime type
+JSON_CONFIG = {"response_mime_type": "application/json"}
+
+_CANONICAL_TYPES = {waste_type.lower(): waste_type for waste_type in WASTE_TYPES}
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def build_prompt(items: Sequence[str]) -> str:
+    lines = "\n".join(f"{index}. {item}" for index, item in enumerate(items))
+    return (
+        "Classify each waste item below into exactly one category from "
+        f"{json.dumps(WASTE_TYPES)}.\n"
+        'Reply with a JSON array of objects {"index": <number>, "category": <category>}, '
+        "one per item, and nothing else.\n\n"
+        f"{lines}"
+    )
+
+
+def canonical_type(category) -> Optional[str]:
+    """The WASTE_TYPES spelling of ``category``, or None if it is not one."""
+    return _CANONICAL_TYPES.get(str(category or "").strip().lower())
+
+
+def parse_rows(text: str, count: int) -> List[Optional[Dict[str, Any]]]:
+    """The objects of a JSON array reply, placed by their ``index`` field;
+    indexes the reply skips (or an unparseable reply) come back as None."""
+    placed: List[Optional[Dict[str, Any]]] = [None] * count
+    try:
+        rows = json.loads(_FENCE.sub("", text.strip()))
+    except json.JSONDecodeError:
+        return placed
+    for row in rows if isinstance(rows, list) else []:
+        if not isinstance(row, dict):
+            continue
+        index = row.get("index")
+        if isinstance(index, int) and 0 <= index < count:
+            placed[index] = row
+    return placed
+
+
+def parse_response(text: str, count: int) -> List[Optional[str]]:
+    """Maps the model's JSON reply back onto the batch; items the reply
+    skips or labels with an unknown category come back as None."""
+    return [canonical_type(row.get("category")) if row else None for row in parse_rows(text, count)]
+
+
+def _classify_batch(model, items: Sequence[str]) -> List[Optional[str]]:
+    with METRICS.timer("model_call_seconds", mode="batch"):
+        response = model.generate_content(build_prompt(items), generation_config=JSON_CONFIG)
+    return parse_response(response.text, len(items))
+
+
+def classify_items(
+    model,
+    items: Sequence[str],
+    batch_size: int = BATCH_SIZE,
+    max_parallel: int = MAX_PARALLEL_BATCHES,
+) -> Tuple[List[Optional[str]], Dict[str, Any]]:
+    """Classifies free-text item descriptions with as few model calls as possible.
+
+    Descriptions are de-duplicated (case- and whitespace-insensitive), packed
+    ``batch_size`` to a prompt, and the batches run ``max_parallel`` at a
+    time. Returns one category (or None) per input item plus a report with
+    the number of API calls and the throughput in items per second.
+    """
+    start = time.perf_counter()
+    keys = [" ".join(str(item).split()).lower() for item in items]
+    unique = list(dict.fromkeys(key for key in keys if key))
+    batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+
+    results: Dict[str, Optional[str]] = {}
+    failed_batches = 0
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        futures = [pool.submit(_classify_batch, model, batch) for batch in batches]
+        for batch, future in zip(batches, futures):
+            try:
+                results.update(zip(batch, future.result()))
+            except Exception:
+                failed_batches += 1
+
+    categories = [results.get(key) for key in keys]
+    seconds = time.perf_counter() - start
+    return categories, {
+        "items": len(items),
+        "unique": len(unique),
+        "api_calls": len(batches),
+        "failed_batches": failed_batches,
+        "unclassified": sum(category is None for category in categories),
+        "seconds": seconds,
+        "items_per_sec": len(items) / seconds if seconds else 0.0,
+    }
@@ -0,0 +1,247 @@
+"""Headless load test of the whole app with a stubbed Gemini model.
+
+For each dataset size the default site's waste log is seeded with that
+many rows through the app's site registry, along with as many schedules
+(at most ``--max-schedules``: the routes page reads every pending one), goals
+and a location, so every page reads the same data. Every page is
+then run through AppTest: one cold run and ``--reruns`` warm reruns,
+timed. Memory per session is the memory retained by extra sessions on the
+same (shared) data, measured with tracemalloc. Finally ``--sessions``
+chat sessions run concurrently, each sending ``--messages`` prompts. The
+FakeModel, with realistic latency, stands in for Gemini behind the app's
+own stack: request scheduler, rate limit, caches and local classifier.
+
+Results go to a JSON file (``--output``) so runs can be diffed:
+
+    python benchmarks/bench_app.py --sizes 1000 100000 1000000 --output bench_app.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import streamlit
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app_state  # noqa: E402
+from bench_goals import seeded_goals  # noqa: E402
+from bench_schedules import build_store  # noqa: E402
+from fake_model import FakeModel  # noqa: E402
+from waste_store import WASTE_TYPES  # noqa: E402
+
+APP = os.path.join(ROOT, "app.py")
+PAGES = ["home", "chat", "tracker", "schedule", "goals", "routes", "sites"]
+GOALS = 20
+
+
+def fresh_app(model: FakeModel):
+    """Drops the process-wide registry, state and model pool, and has the
+    next model built around ``model`` instead of a Gemini client."""
+    app_state.setup_gemini = lambda config: model
+    for factory in (app_state.get_shared_model, app_state.get_response_cache,
+                    app_state.get_site_registry, app_state.get_state_backend):
+        factory.clear()
+
+
+def seed_site(rows: int, schedules: int, seed: int = 0):
+    """Seeds the default site, as the app opens it, with ``rows`` log
+    entries, ``schedules`` schedules, GOALS goals and a location."""
+    registry = app_state.site_registry()
+    site = registry.site(registry.default)
+    rng = np.random.default_rng(seed)
+    site.waste.append_frame(pd.DataFrame({
+        "date": pd.Timestamp.today().normalize() - pd.to_timedelta(rng.integers(0, 730, rows), unit="D"),
+        "type": rng.choice(WASTE_TYPES, rows),
+        "weight": rng.uniform(0.1, 25.0, rows).round(1),
+        "notes": "",
+    }))
+    build_store(schedules, seed, site.schedules)
+    seeded_goals(GOALS, seed, site.goals)
+    registry.set_location(site.name, 51.5, -0.12)
+    return site
+
+
+def new_session(page: str) -> AppTest:
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.session_state["page"] = page
+    return at
+
+
+def timed_run(at: AppTest) -> float:
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed * 1000
+
+
+def percentile(values, q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def bench_pages(reruns: int):
+    results = {}
+    for page in PAGES:
+        at = new_session(page)
+        first = timed_run(at)
+        warm = [timed_run(at) for _ in range(reruns)]
+        results[page] = {
+            "first_run_ms": first,
+            "rerun_p50_ms": percentile(warm, 50),
+            "rerun_p95_ms": percentile(warm, 95),
+        }
+        print(f"    {page:<10} first {first:8.1f} ms   rerun p50 {results[page]['rerun_p50_ms']:8.1f} ms")
+    return results
+
+
+def bench_session_memory(sessions: int = 5):
+    """Bytes retained per extra session that has visited every page."""
+    kept = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(sessions):
+        at = new_session("home")
+        for page in PAGES:
+            at.session_state["page"] = page
+            at.run()
+        kept.append(at)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / sessions
+
+
+def bench_concurrent_chat(sessions: int, messages: int, model: FakeModel):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def user(index: int):
+        try:
+            at = new_session("chat")
+            at.session_state["stream_responses"] = index % 2 == 0
+            at.run()
+            for turn in range(messages):
+                at.chat_input[0].set_value(f"session {index} question {turn}: how do I reduce packaging?")
+                elapsed = timed_run(at)
+                with lock:
+                    latencies.append(elapsed)
+        except Exception as e:
+            with lock:
+                errors.append(repr(e))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(index,)) for index in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    return {
+        "sessions": sessions,
+        "messages_per_session": messages,
+        "completed": len(latencies),
+        "errors": errors[:5],
+        "turn_p50_ms": percentile(latencies, 50),
+        "turn_p95_ms": percentile(latencies, 95),
+        "turn_p99_ms": percentile(latencies, 99),
+        "turns_per_sec": len(latencies) / wall if wall else 0.0,
+        "model_calls": model.calls,
+        "max_in_flight": model.max_in_flight,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--max-schedules", type=int, default=10_000, help="schedules seeded per size, at most")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent chat sessions")
+    parser.add_argument("--messages", type=int, default=3, help="chat prompts per session")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model time to first token, seconds")
+    parser.add_argument("--output", default="bench_app.json")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+
+    # The app reads its config and secrets from the working directory: run
+    # it against in-memory state in a scratch copy so the real files are
+    # never touched. The placeholder key only makes the app build its full
+    # model stack; fresh_app swaps the Gemini client for a FakeModel
+    workdir = tempfile.mkdtemp(prefix="bench_app_")
+    with open(os.path.join(ROOT, "Gemini_config.json")) as file:
+        config = json.load(file)
+    config["waste_store"] = {"backend": "memory"}
+    config["state_backend"] = {"backend": "memory"}
+    with open(os.path.join(workdir, "Gemini_config.json"), "w") as file:
+        json.dump(config, file)
+    os.makedirs(os.path.join(workdir, ".streamlit"))
+    with open(os.path.join(workdir, ".streamlit", "secrets.toml"), "w") as file:
+        file.write('API_KEY = "bench"\n')
+    os.chdir(workdir)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "sizes": {},
+    }
+    try:
+        for size in args.sizes:
+            print(f"{size:,} rows")
+            fresh_app(FakeModel(first_chunk_delay=args.latency, chunk_delay=0.005))
+            start = time.perf_counter()
+            site = seed_site(size, min(size, args.max_schedules))
+            seed_seconds = time.perf_counter() - start
+            pages = bench_pages(args.reruns)
+            memory = bench_session_memory()
+            print(f"    memory per session {memory / 2 ** 20:.2f} MB")
+            report["sizes"][str(size)] = {
+                "seed_seconds": seed_seconds,
+                "waste_log_mb": site.waste.frame().memory_usage(deep=True).sum() / 2 ** 20,
+                "pages": pages,
+                "memory_per_session_mb": memory / 2 ** 20,
+            }
+
+        model = FakeModel(first_chunk_delay=args.latency, chunk_delay=0.005)
+        fresh_app(model)
+        seed_site(1_000, 1_000)
+        chat = bench_concurrent_chat(args.sessions, args.messages, model)
+        print(
+            f"{chat['sessions']} concurrent chat sessions: turn p50 {chat['turn_p50_ms']:.0f} ms, "
+            f"p95 {chat['turn_p95_ms']:.0f} ms, {chat['turns_per_sec']:.1f} turns/s, "
+            f"{chat['model_calls']} model calls, at most {chat['max_in_flight']} in flight"
+        )
+        report["concurrent_chat"] = chat
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
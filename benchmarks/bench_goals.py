@@ -0,0 +1,101 @@
+"""Cost of re-evaluating goals after each logged entry, as the log grows.
+
+Every goal is re-evaluated after a one-entry append, once through
+GoalStore.progress (period totals kept up to date by the store's running
+aggregates, so the append itself does that work) and once by rescanning
+the whole log for each goal, the way a naive implementation would.
+
+    python benchmarks/bench_goals.py --rows 10000 100000 1000000 --goals 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from goals import GOAL_KINDS, PERIODS, GoalStore, period_start  # noqa: E402
+from waste_store import WASTE_TYPES, MemoryWasteStore  # noqa: E402
+
+
+def seeded_store(rows: int, seed: int = 0) -> MemoryWasteStore:
+    rng = np.random.default_rng(seed)
+    store = MemoryWasteStore()
+    store.append_frame(pd.DataFrame({
+        "date": pd.Timestamp.today().normalize() - pd.to_timedelta(rng.integers(0, 730, rows), unit="D"),
+        "type": rng.choice(WASTE_TYPES, rows),
+        "weight": rng.uniform(0.1, 25.0, rows).round(1),
+        "notes": "",
+    }))
+    return store
+
+
+def seeded_goals(count: int, seed: int = 0, goals: Optional[GoalStore] = None) -> GoalStore:
+    rng = np.random.default_rng(seed)
+    goals = GoalStore() if goals is None else goals
+    for _ in range(count):
+        goals.add({
+            "kind": rng.choice(list(GOAL_KINDS)),
+            "waste_type": rng.choice(WASTE_TYPES),
+            "period": rng.choice(PERIODS),
+            "target": float(rng.integers(5, 60)),
+            "created": date.today() - timedelta(days=90),
+        })
+    return goals
+
+
+def rescan(frame: pd.DataFrame, goals: GoalStore, today: date):
+    """This and last period's weight per goal, straight from the log."""
+    results = {}
+    for goal in goals:
+        start = period_start(today, goal.period)
+        previous = period_start(start - timedelta(days=1), goal.period)
+        rows = frame[(frame["type"] == goal.waste_type) & (frame["date"] >= previous)]
+        current = rows.loc[rows["date"] >= start, "weight"].sum()
+        results[goal.id] = (current, rows["weight"].sum() - current)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--goals", type=int, default=50)
+    parser.add_argument("--appends", type=int, default=20)
+    args = parser.parse_args()
+
+    today = date.today()
+    entry = [{"date": today, "type": "Recyclables", "weight": 2.5, "notes": ""}]
+    print(f"{'entries':>10}{'append ms':>11}{'evaluate ms':>13}{'rescan ms':>11}")
+    for rows in args.rows:
+        store, goals = seeded_store(rows), seeded_goals(args.goals)
+        goals.progress(store, today)  # builds the aggregates once
+        appends, incremental, scans = [], [], []
+        for _ in range(args.appends):
+            start = time.perf_counter()
+            store.append(entry)
+            appends.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            progress = goals.progress(store, today)
+            incremental.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            scanned = rescan(store.frame(), goals, today)
+            scans.append(time.perf_counter() - start)
+        for goal in goals:
+            assert abs(progress[goal.id].current - scanned[goal.id][0]) < 1e-6 * max(1.0, scanned[goal.id][0])
+        print(
+            f"{rows:>10,}{statistics.median(appends) * 1000:>11.2f}"
+            f"{statistics.median(incremental) * 1000:>13.3f}"
+            f"{statistics.median(scans) * 1000:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Payload and latency of photo identification: raw uploads vs downscaled,
+batched and hash-cached requests.
+
+Synthetic 12 MP camera JPEGs are identified by a FakeModel whose latency
+models a mobile uplink: a fixed round trip, plus payload size over the
+uplink bandwidth, plus model time per image. The baseline sends every
+photo as uploaded, one request each; image_classify.identify_images
+downscales, batches and caches. A second pass re-submits the same items
+photographed again (re-encoded, resized, brightened) to exercise the
+perceptual-hash cache.
+
+    python benchmarks/bench_images.py --photos 8 --uplink-mbps 5
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_model import FakeModel  # noqa: E402
+from image_classify import IMAGES_PER_REQUEST, ImageHashCache, build_prompt, identify_images  # noqa: E402
+
+
+class UplinkModel(FakeModel):
+    """FakeModel that sleeps as long as sending its prompt would take."""
+
+    def __init__(self, round_trip: float, bytes_per_second: float, per_image: float):
+        super().__init__(responder=self.respond)
+        self.round_trip = round_trip
+        self.bytes_per_second = bytes_per_second
+        self.per_image = per_image
+        self.bytes_sent = 0
+
+    @staticmethod
+    def respond(prompt) -> str:
+        images = len(prompt) - 1
+        return json.dumps([
+            {"index": index, "item": "plastic bottle", "category": "Recyclables", "disposal": "Rinse and recycle."}
+            for index in range(images)
+        ])
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        payload = sum(len(part["data"]) for part in prompt[1:])
+        with self._lock:
+            self.bytes_sent += payload
+        time.sleep(self.round_trip + payload / self.bytes_per_second + self.per_image * (len(prompt) - 1))
+        return super().generate_content(prompt, stream=stream, **kwargs)
+
+
+def camera_photo(seed: int, size=(4000, 3000), quality: int = 92) -> bytes:
+    """Smooth colour blobs plus sensor-like noise, which JPEG compresses
+    about as badly as a real photo."""
+    rng = np.random.default_rng(seed)
+    blobs = Image.fromarray((rng.random((12, 16, 3)) * 255).astype(np.uint8)).resize(size, Image.Resampling.BICUBIC)
+    noise = rng.normal(0, 8, (size[1], size[0], 3))
+    pixels = np.clip(np.asarray(blobs, dtype=np.float32) + noise, 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def retaken(photo: bytes) -> bytes:
+    """The same item photographed again: smaller, brighter, re-encoded."""
+    image = Image.open(io.BytesIO(photo))
+    image = image.resize((image.width * 3 // 4, image.height * 3 // 4)).point(lambda value: min(255, value + 8))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=75)
+    return buffer.getvalue()
+
+
+def baseline(model: UplinkModel, photos):
+    start = time.perf_counter()
+    latencies = []
+    for photo in photos:
+        call = time.perf_counter()
+        model.generate_content([build_prompt(1), {"mime_type": "image/jpeg", "data": photo}])
+        latencies.append(time.perf_counter() - call)
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--photos", type=int, default=8)
+    parser.add_argument("--uplink-mbps", type=float, default=5.0)
+    parser.add_argument("--round-trip", type=float, default=0.3, help="seconds per request")
+    parser.add_argument("--per-image", type=float, default=0.15, help="model seconds per image")
+    parser.add_argument("--images-per-request", type=int, default=IMAGES_PER_REQUEST)
+    args = parser.parse_args()
+    bandwidth = args.uplink_mbps * 1e6 / 8
+
+    photos = [camera_photo(seed) for seed in range(args.photos)]
+    uploaded = sum(map(len, photos))
+    print(f"{args.photos} photos, {uploaded / 2 ** 20:.1f} MB as uploaded, {args.uplink_mbps:g} Mbit/s uplink")
+
+    model = UplinkModel(args.round_trip, bandwidth, args.per_image)
+    seconds, latencies = baseline(model, photos)
+    print(
+        f"  raw, one per request   {model.bytes_sent / len(photos) / 1024:8.0f} KB/image"
+        f"  {statistics.median(latencies) * 1000:7.0f} ms/image  {model.calls:3d} calls  {seconds:6.2f} s total"
+    )
+
+    model = UplinkModel(args.round_trip, bandwidth, args.per_image)
+    cache = ImageHashCache()
+    results, report = identify_images(model, photos, cache, images_per_request=args.images_per_request)
+    per_image = [result.prepare_ms + result.latency_ms for result in results if result is not None]
+    print(
+        f"  downscaled, batched    {report['sent_bytes'] / len(photos) / 1024:8.0f} KB/image"
+        f"  {statistics.median(per_image):7.0f} ms/image  {report['api_calls']:3d} calls  {report['seconds']:6.2f} s total"
+        f"  (prepare {statistics.median(result.prepare_ms for result in results):.0f} ms/image)"
+    )
+
+    again = [retaken(photo) for photo in photos]
+    results, report = identify_images(model, again, cache, images_per_request=args.images_per_request)
+    print(
+        f"  same items re-shot     {report['cached']}/{len(again)} from the hash cache,"
+        f" {report['api_calls']} calls, {report['seconds']:6.2f} s total"
+    )
+    distinct = [camera_photo(seed) for seed in range(1000, 1000 + args.photos)]
+    results, report = identify_images(model, distinct, cache, images_per_request=args.images_per_request)
+    print(f"  new items              {report['cached']}/{len(distinct)} false cache hits")
+
+
+if __name__ == "__main__":
+    main()
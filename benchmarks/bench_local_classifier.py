@@ -0,0 +1,57 @@
+"""Hit rate and latency of the local classifier on sample chat prompts.
+
+    python benchmarks/bench_local_classifier.py --repeat 10000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from local_classifier import LocalClassifier  # noqa: E402
+
+PROMPTS = [
+    "How do I recycle batteries?",
+    "Is a pizza box recyclable?",
+    "Where do I throw away a banana peel?",
+    "Can I recycle glass jars?",
+    "How should I dispose of an old phone?",
+    "What bin does a coffee cup go in?",
+    "Where does leftover paint go?",
+    "Can I compost eggshells and coffee grounds?",
+    "How do I dispose of a broken laptop charger?",
+    "Are aluminum cans recyclable?",
+    "What are good ways to reduce plastic use at home?",
+    "Explain the environmental impact of landfills",
+    "How can my office cut food waste?",
+    "What is the carbon footprint of recycling?",
+    "Why is recycling glass important?",
+    "How much energy does recycling aluminum save?",
+    "What happens to plastic bottles after recycling?",
+    "How does composting food reduce methane emissions?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10000)
+    args = parser.parse_args()
+
+    classifier = LocalClassifier()
+    answers = [classifier.answer(prompt) for prompt in PROMPTS]
+    for prompt, answer in zip(PROMPTS, answers):
+        label = answer.rsplit("category: ", 1)[1].rstrip("_") if answer else "-> LLM"
+        print(f"  {label:<12} {prompt}")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for prompt in PROMPTS:
+            classifier.answer(prompt)
+    per_query = (time.perf_counter() - start) / (args.repeat * len(PROMPTS))
+    hits = sum(answer is not None for answer in answers)
+    print(f"hit rate {hits}/{len(PROMPTS)} ({hits / len(PROMPTS):.0%}), {per_query * 1e6:.1f} us per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Bytes per waste entry and per schedule, before and after compaction.
+
+Waste entries are measured three ways: a list of dicts (how the log was
+first kept in session state), the typed DataFrame the store used to
+concatenate appends into, and the store's WasteColumns buffers. Schedules
+are measured as plain dicts and as Schedule records. Python objects are
+measured with tracemalloc, frames with memory_usage(deep=True).
+
+    python benchmarks/bench_memory.py --rows 100000 1000000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, time as clock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recurrence import WEEKDAYS, Recurrence  # noqa: E402
+from schedules import Schedule  # noqa: E402
+from waste_store import WASTE_TYPES, MemoryWasteStore, typed_frame  # noqa: E402
+
+NOTES = ["", "", "", "", "kitchen scraps", "office clean-out", "bin day", "garden trimmings"]
+
+
+def retained(build):
+    """Bytes still allocated after ``build()`` returns, and its result."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def synthetic_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return typed_frame(pd.DataFrame({
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D"),
+        "type": rng.choice(WASTE_TYPES, rows),
+        "weight": rng.uniform(0.1, 25.0, rows).round(1),
+        "notes": rng.choice(NOTES, rows),
+    }))
+
+
+def schedule_fields(count: int):
+    for index in range(count):
+        day = WEEKDAYS[index % 5]
+        at = clock(6 + index % 12, 15 * (index % 4))
+        yield {
+            "type": "General",
+            "day": day,
+            # As on the schedule page: a fresh string per schedule
+            "time": at.strftime("%I:%M %p"),
+            "frequency": "Weekly",
+            "notes": "",
+            "rule": Recurrence.from_schedule(day, at, "Weekly", date(2024, 1, 1)),
+        }
+
+
+def bench_waste(rows: int):
+    frame = synthetic_frame(rows)
+    dicts, _ = retained(lambda: frame.to_dict("records"))
+    typed = frame.memory_usage(deep=True, index=False).sum()
+    store = MemoryWasteStore()
+    store.append_frame(frame)
+    columns = store.nbytes()
+
+    # Reading the log back after a one-entry append: the old store folded
+    # the pending row in with a concat, the columns only take new views.
+    # The first append may double the buffers, so it is not timed
+    entry = [{"date": "2025-01-01", "type": "Organic", "weight": 1.0, "notes": ""}]
+    pending = typed_frame(pd.DataFrame(entry))
+    start = time.perf_counter()
+    pd.concat([frame, pending], ignore_index=True)
+    concat_ms = (time.perf_counter() - start) * 1000
+    store.append(entry)
+    store.frame()
+    store.append(entry)
+    start = time.perf_counter()
+    store.frame()
+    read_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{rows:>9,} entries")
+    print(f"    list of dicts      {dicts / rows:8.1f} B/entry")
+    print(f"    typed DataFrame    {typed / rows:8.1f} B/entry")
+    print(f"    WasteColumns       {columns / rows:8.1f} B/entry  ({typed / columns:.1f}x smaller than the frame,"
+          f" {dicts / columns:.0f}x than dicts)")
+    print(f"    read after append  {read_ms:8.2f} ms  (concat into the frame: {concat_ms:.2f} ms)")
+
+
+def bench_schedules(count: int):
+    as_dicts, _ = retained(lambda: [dict(fields, id=index) for index, fields in enumerate(schedule_fields(count))])
+    as_records, _ = retained(lambda: [Schedule(index, **fields) for index, fields in enumerate(schedule_fields(count))])
+    print(f"{count:>9,} schedules")
+    print(f"    dicts              {as_dicts / count:8.1f} B/schedule")
+    print(f"    Schedule records   {as_records / count:8.1f} B/schedule  ({as_dicts / as_records:.1f}x smaller)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--schedules", type=int, default=100_000)
+    args = parser.parse_args()
+    for rows in args.rows:
+        bench_waste(rows)
+    bench_schedules(args.schedules)
+
+
+if __name__ == "__main__":
+    main()
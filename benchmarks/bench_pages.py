@@ -0,0 +1,97 @@
+"""Import time and first paint of each page, each in a fresh interpreter.
+
+For every page in app.PAGES two child processes are started: one times
+importing ``views.<page>`` on its own, the other times the first AppTest
+run of the app on that page (imports included) and a warm rerun, and
+records which heavy libraries ended up loaded. The app runs against an
+in-memory waste log in a scratch directory, so nothing is written next to
+the real config.
+
+    python benchmarks/bench_pages.py --repeat 3
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+PAGES = ["home", "chat", "tracker", "schedule", "goals", "routes", "sites"]
+HEAVY = ["pandas", "plotly.express", "google.generativeai"]
+
+
+def child_import(page: str):
+    import importlib
+    start = time.perf_counter()
+    importlib.import_module(f"views.{page}")
+    return {"import_ms": (time.perf_counter() - start) * 1000}
+
+
+def child_paint(page: str):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state["page"] = page
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return {
+        "first_paint_ms": first * 1000,
+        "rerun_ms": rerun * 1000,
+        "loaded": [name for name in HEAVY if name in sys.modules],
+    }
+
+
+def run_child(mode: str, page: str, workdir: str):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, page],
+        cwd=workdir, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PAGE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, ROOT)
+        mode, page = args.child
+        print(json.dumps(child_import(page) if mode == "import" else child_paint(page)))
+        return
+
+    workdir = tempfile.mkdtemp(prefix="bench_pages_")
+    try:
+        with open(os.path.join(ROOT, "Gemini_config.json")) as file:
+            config = json.load(file)
+        config["waste_store"] = {"backend": "memory"}
+        with open(os.path.join(workdir, "Gemini_config.json"), "w") as file:
+            json.dump(config, file)
+
+        print(f"{'page':<10}{'import ms':>11}{'first paint ms':>16}{'rerun ms':>10}  heavy libraries loaded")
+        for page in PAGES:
+            imports = [run_child("import", page, workdir)["import_ms"] for _ in range(args.repeat)]
+            paints = [run_child("paint", page, workdir) for _ in range(args.repeat)]
+            print(
+                f"{page:<10}{statistics.median(imports):>11.0f}"
+                f"{statistics.median(p['first_paint_ms'] for p in paints):>16.0f}"
+                f"{statistics.median(p['rerun_ms'] for p in paints):>10.0f}"
+                f"  {', '.join(paints[-1]['loaded']) or '-'}"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Route planning over synthetic sites scattered around a city.
+
+Sites cluster around a few neighbourhood centres; collections are booked
+mostly early in the week, with log-normal volumes. For each size the full
+plan_routes run is timed, and its stages are timed on their own: day
+balancing, and nearest-neighbour and 2-opt over the busiest day. Route
+length is compared between nearest neighbour alone and after 2-opt.
+
+    python benchmarks/bench_routes.py --stops 500 2000 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routing import (  # noqa: E402
+    WORKDAYS, Stop, balance_days, distance_matrix, nearest_neighbour, plan_routes, project, tour_length, two_opt,
+)
+
+CITY = (51.50, -0.12)
+# Early-week bias of the booked days, Monday to Friday
+BOOKED_DAYS = [0.35, 0.25, 0.2, 0.1, 0.1]
+
+
+def synthetic_stops(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centres = np.column_stack([CITY[0] + rng.normal(0, 0.08, 12), CITY[1] + rng.normal(0, 0.12, 12)])
+    home = rng.integers(0, len(centres), count)
+    lat = centres[home, 0] + rng.normal(0, 0.015, count)
+    lon = centres[home, 1] + rng.normal(0, 0.02, count)
+    days = rng.choice(WORKDAYS, count, p=BOOKED_DAYS)
+    volumes = rng.lognormal(4.5, 0.7, count)
+    return [Stop(f"site-{index}", lat[index], lon[index], volumes[index], days[index]) for index in range(count)]
+
+
+def imbalance(loads) -> float:
+    """Heaviest day over the average day."""
+    loads = np.asarray(loads)
+    return float(loads.max() / loads.mean()) if loads.mean() else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stops", type=int, nargs="+", default=[500, 2000, 5000])
+    parser.add_argument("--capacity", type=float, default=8000.0, help="truck capacity, kg")
+    args = parser.parse_args()
+
+    print(f"{'stops':>6}{'plan s':>8}{'balance ms':>12}{'NN ms':>8}{'2-opt ms':>10}"
+          f"{'NN km':>8}{'2-opt km':>10}{'imbalance':>17}{'trips':>7}")
+    for count in args.stops:
+        stops = synthetic_stops(count)
+        lat = np.array([stop.lat for stop in stops])
+        lon = np.array([stop.lon for stop in stops])
+        volumes = np.array([stop.volume for stop in stops])
+        booked = np.array([WORKDAYS.index(stop.day) for stop in stops])
+
+        start = time.perf_counter()
+        days = balance_days(project(lat, lon), volumes, booked)
+        balance_ms = (time.perf_counter() - start) * 1000
+
+        # The busiest balanced day, depot at the city centre
+        busiest = np.flatnonzero(days == np.bincount(days).argmax())
+        dist = distance_matrix(np.concatenate([[CITY[0]], lat[busiest]]), np.concatenate([[CITY[1]], lon[busiest]]))
+        start = time.perf_counter()
+        tour = nearest_neighbour(dist)
+        nn_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        improved = two_opt(tour, dist)
+        opt_ms = (time.perf_counter() - start) * 1000
+
+        plan = plan_routes(stops, CITY, args.capacity)
+        before = np.bincount(booked, weights=volumes, minlength=len(WORKDAYS))
+        after = [day.load for day in plan.days]
+        print(
+            f"{count:>6}{plan.seconds:>8.2f}{balance_ms:>12.1f}{nn_ms:>8.1f}{opt_ms:>10.1f}"
+            f"{tour_length(tour, dist):>8.0f}{tour_length(improved, dist):>10.0f}"
+            f"{imbalance(before):>9.2f} -> {imbalance(after):.2f}"
+            f"{sum(len(day.trips) for day in plan.days):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Next-due queries and year-long expansion over synthetic schedules.
+
+    python benchmarks/bench_schedules.py --schedules 1000 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, time as clock, timedelta
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recurrence import FREQUENCY_WEEKS, WEEKDAYS, Recurrence  # noqa: E402
+from schedules import ScheduleStore  # noqa: E402
+
+
+def build_store(count: int, seed: int = 0, store: Optional[ScheduleStore] = None) -> ScheduleStore:
+    rng = random.Random(seed)
+    store = ScheduleStore() if store is None else store
+    for _ in range(count):
+        day = rng.choice(WEEKDAYS[:5])
+        frequency = rng.choice(list(FREQUENCY_WEEKS))
+        at = clock(rng.randrange(6, 18), rng.choice([0, 15, 30, 45]))
+        anchor = date.today() - timedelta(days=rng.randrange(0, 365))
+        store.add({
+            "type": "General",
+            "day": day,
+            "time": at.strftime("%I:%M %p"),
+            "frequency": frequency,
+            "rule": Recurrence.from_schedule(day, at, frequency, anchor),
+        })
+    return store
+
+
+def timed(fn, repeat: int = 1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schedules", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    now = datetime.now()
+    year_end = now + timedelta(days=365)
+    for count in args.schedules:
+        store = build_store(count)
+        next_ten, _ = timed(lambda: store.upcoming(10, now), repeat=100)
+        scan, _ = timed(lambda: sorted(s.rule.next_after(now) for s in store)[:10])
+        expand, total = timed(lambda: sum(1 for s in store for _ in s.rule.occurrences(now, year_end)))
+        print(
+            f"{count:>7} schedules: next 10 due {next_ten * 1e6:8.1f} us"
+            f" (full scan {scan * 1e3:7.1f} ms)"
+            f" | expand 1 year: {total:,} occurrences in {expand * 1e3:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
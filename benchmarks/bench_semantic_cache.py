@@ -0,0 +1,95 @@
+"""Lookup latency, hit rate and false hits of the semantic cache.
+
+    python benchmarks/bench_semantic_cache.py --entries 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semantic_cache import SemanticCache  # noqa: E402
+
+# (cached question, paraphrase that should hit it)
+PARAPHRASES = [
+    ("Can I recycle pizza boxes?", "Are pizza boxes recyclable?"),
+    ("How do I dispose of old paint?", "Where should I dispose of old paint?"),
+    ("Tips for reducing plastic waste", "How to reduce plastic waste"),
+    ("How do I compost coffee grounds?", "Can coffee grounds be composted?"),
+    ("Where do dead batteries go?", "Where should dead batteries go?"),
+    ("Is styrofoam recyclable?", "Can I recycle styrofoam?"),
+]
+# Questions about different items that must not be answered from each other
+DISTINCT = [
+    "Can I recycle glass jars?",
+    "How do I dispose of old motor oil?",
+    "Tips for reducing food waste",
+    "How do I compost banana peels?",
+    "Where do broken phones go?",
+    "Is bubble wrap recyclable?",
+]
+# (cached question, question about something else with nearly the same words)
+NEAR_MISSES = [
+    ("Can I recycle cans?", "Can I recycle paint cans?"),
+    ("How do I dispose of meat?", "How do I dispose of meat trays?"),
+    ("Should I recycle batteries?", "Should I not recycle batteries?"),
+    ("Where does my phone go?", "Where does my phone case go?"),
+    ("Can I recycle paper?", "Can I recycle paper towels?"),
+    ("Is glass recyclable?", "Is broken glass recyclable?"),
+]
+TEMPLATES = [
+    "how do I dispose of {}", "can I recycle {}", "is {} recyclable", "where does {} go",
+    "what bin does {} go in", "how to reduce {} waste", "what happens to {} in a landfill",
+]
+
+
+def synthetic_prompts(count: int, seed: int):
+    # Made-up item names, so the filler never answers the questions above
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choices(letters, k=rng.randint(4, 9))) for _ in range(5000)]
+    for _ in range(count):
+        item = " ".join(rng.sample(vocabulary, 2))
+        yield rng.choice(TEMPLATES).format(item)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cache = SemanticCache(max_entries=args.entries + len(PARAPHRASES) + len(NEAR_MISSES))
+    start = time.perf_counter()
+    for prompt in synthetic_prompts(args.entries, args.seed):
+        cache.put(prompt, "synthetic")
+    fill = time.perf_counter() - start
+    for question, _ in PARAPHRASES + NEAR_MISSES:
+        cache.put(question, question)
+
+    hits = sum(cache.get(paraphrase) == question for question, paraphrase in PARAPHRASES)
+    # Any reply at all for these is a false hit
+    false_hits = [(prompt, cache.get(prompt)) for prompt in DISTINCT]
+    false_hits = [(prompt, reply) for prompt, reply in false_hits if reply is not None]
+    near_false = [(other, cache.get(other)) for _, other in NEAR_MISSES]
+    near_false = [(prompt, reply) for prompt, reply in near_false if reply is not None]
+
+    probes = list(synthetic_prompts(args.lookups, args.seed + 1))
+    start = time.perf_counter()
+    for prompt in probes:
+        cache.get(prompt)
+    per_lookup = (time.perf_counter() - start) / len(probes)
+
+    print(f"{len(cache):,} entries, filled in {fill:.1f}s")
+    print(f"lookup {per_lookup * 1e6:.1f} us at {len(cache):,} entries")
+    print(f"paraphrase hits {hits}/{len(PARAPHRASES)}, false hits {len(false_hits)}/{len(DISTINCT)}")
+    print(f"near misses: false-hit rate {len(near_false) / len(NEAR_MISSES):.0%}")
+    for prompt, reply in false_hits + near_false:
+        print(f"  false hit: {prompt!r} -> {reply!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-session cost of getting a model client, per-session vs shared.
+
+Before clients were shared, every new browser session parsed the config
+and built a GenerativeModel (``per-session``: ``json.load`` of the file plus
+``setup_gemini``). Sessions now take the process-wide client from
+``get_shared_model`` (``shared``), which checks the config digest and
+returns the cached client. ``per-session stack`` rebuilds what a session
+would need without sharing today: the scheduler, caches and local
+classifier around the client. All are timed directly, after a first
+client has been built so the one-off import of google.generativeai is
+reported separately. The app runs from a scratch directory with a copy
+of the config and a placeholder API key; building a client makes no
+request.
+
+    python benchmarks/bench_startup.py --sessions 200
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def timed(call, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples):
+    samples = sorted(samples)
+    print(
+        f"{label:>17}: median {statistics.median(samples) * 1000:8.3f} ms"
+        f"  p95 {samples[int(len(samples) * 0.95) - 1] * 1000:8.3f} ms  ({len(samples)} sessions)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        shutil.copy(os.path.join(ROOT, "Gemini_config.json"), workdir)
+        os.makedirs(os.path.join(workdir, ".streamlit"))
+        with open(os.path.join(workdir, ".streamlit", "secrets.toml"), "w") as file:
+            file.write('API_KEY = "bench"\n')
+        os.chdir(workdir)
+
+        from app_state import CONFIG_FILE, config_digest, get_shared_model, load_config, setup_gemini
+
+        def per_session():
+            with open(CONFIG_FILE) as file:
+                return setup_gemini(json.load(file))
+
+        def shared():
+            return get_shared_model(CONFIG_FILE, config_digest(CONFIG_FILE))
+
+        def per_session_stack():
+            get_shared_model.clear()
+            return shared()
+
+        start = time.perf_counter()
+        setup_gemini(load_config(CONFIG_FILE))
+        print(f"first client, importing google.generativeai: {(time.perf_counter() - start) * 1000:.0f} ms")
+        report("per-session", timed(per_session, args.sessions))
+        report("per-session stack", timed(per_session_stack, args.sessions))
+        report("shared", timed(shared, args.sessions))
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
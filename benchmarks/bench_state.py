@@ -0,0 +1,93 @@
+"""Read, write and cross-process visibility of the shared state backends.
+
+For SQLite (WAL) and the Redis protocol (against fake_redis.RespServer,
+with a simulated network hop), a collection is seeded with schedule-sized
+records. Reads through a CachedCollection are timed against loading the
+collection from the backend each time; writes are timed through the cache.
+Two connections then stand in for two app processes: one writes, the other
+keeps reading through its cache, and the delay until the write shows up is
+compared with ``max_staleness``.
+
+    python benchmarks/bench_state.py --records 1000 --staleness 0.5
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_redis import RespServer  # noqa: E402
+from state_backend import CachedCollection, RedisStateBackend, SQLiteStateBackend  # noqa: E402
+
+RECORD = {
+    "type": "Recyclables", "day": "Monday", "time": "09:00 AM", "frequency": "Weekly", "notes": "", "status": "pending",
+    "rule": {"weekday": 0, "at": "09:00:00", "frequency": "Weekly", "anchor": "2026-01-05"},
+}
+
+
+def timed(call, repeat: int) -> float:
+    """Median seconds per call."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def visibility(writer: CachedCollection, reader: CachedCollection, trials: int, seed: int = 0):
+    """Seconds from each write returning until ``reader`` sees it. Writes
+    land at random points of the reader's refresh cycle."""
+    rng = random.Random(seed)
+    delays = []
+    for trial in range(trials):
+        time.sleep(rng.uniform(0, reader.max_staleness))
+        record_id = writer.put({**RECORD, "notes": f"trial {trial}"})
+        written = time.perf_counter()
+        while record_id not in reader.records():
+            time.sleep(0.001)
+        delays.append(time.perf_counter() - written)
+    return delays
+
+
+def run(name: str, open_backend, args):
+    collection = "bench"
+    writer = CachedCollection(open_backend(), collection, args.staleness)
+    for _ in range(args.records):
+        writer.put(RECORD)
+    reader = CachedCollection(open_backend(), collection, args.staleness)
+
+    cached = timed(reader.records, 2000)
+    uncached = timed(lambda: reader.backend.load(collection), 20)
+    write = timed(lambda: writer.put(RECORD), 200)
+    delays = visibility(writer, reader, args.trials)
+    print(
+        f"{name:<8}{cached * 1e6:>11.2f}{uncached * 1000:>13.2f}{uncached / cached:>9.0f}x"
+        f"{write * 1000:>10.2f}{statistics.median(delays) * 1000:>16.0f}{max(delays) * 1000:>9.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--staleness", type=float, default=0.5, help="max_staleness of the caches, seconds")
+    parser.add_argument("--trials", type=int, default=10, help="writes timed for visibility")
+    parser.add_argument("--latency", type=float, default=0.2, help="Redis stand-in reply delay, ms")
+    args = parser.parse_args()
+
+    print(f"{args.records} records, max_staleness {args.staleness * 1000:.0f} ms")
+    print(f"{'backend':<8}{'cached µs':>11}{'uncached ms':>13}{'':>10}{'write ms':>10}"
+          f"{'visible p50 ms':>16}{'max ms':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state.db")
+        run("sqlite", lambda: SQLiteStateBackend(path), args)
+    with RespServer(latency=args.latency / 1000) as server:
+        run("redis", lambda: RedisStateBackend(server.host, server.port), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import tempfile
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from batch_classify import canonical_type
+from waste_store import COLUMNS, WasteStore, typed_frame
+
+IMPORT_CHUNK_ROWS = 50_000
+EXPORT_CHUNK_ROWS = 100_000
+# Rejected rows kept for the report; the rest are only counted
+MAX_REJECTED_SAMPLE = 1000
+REQUIRED_COLUMNS = ["date", "type", "weight"]
+
+
+def iter_chunks(file, file_format: str, chunk_rows: int = IMPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Reads an uploaded CSV or Parquet file ``chunk_rows`` rows at a time."""
+    if file_format == "csv":
+        yield from pd.read_csv(file, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+    elif file_format == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported file format: {file_format}")
+
+
+def validate_chunk(chunk: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Splits a raw chunk into typed valid rows and rejected rows.
+
+    Rejected rows keep their original values plus a ``reason`` column.
+    Types are matched case-insensitively against WASTE_TYPES, weights must
+    be positive finite numbers and dates must parse; dates with a UTC
+    offset are stored as UTC.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    # A file repeats a handful of spellings, so each is matched once
+    raw_types = chunk["type"].astype(str)
+    types = raw_types.map({value: canonical_type(value) for value in raw_types.unique()})
+    weights = pd.to_numeric(chunk["weight"], errors="coerce")
+    # Offsets are converted to UTC: the log holds naive datetimes, and a
+    # file can mix offsets from row to row
+    dates = pd.to_datetime(chunk["date"], errors="coerce", format="mixed", utc=True).dt.tz_localize(None)
+
+    reason = pd.Series("", index=chunk.index, dtype=object)
+    reason = reason.mask(~(np.isfinite(weights) & (weights > 0)), "invalid weight")
+    reason = reason.mask(types.isna(), "unknown type")
+    reason = reason.mask(dates.isna(), "invalid date")
+    rejected_mask = reason != ""
+
+    valid = ~rejected_mask
+    notes = chunk["notes"] if "notes" in chunk.columns else pd.Series("", index=chunk.index)
+    accepted = typed_frame(pd.DataFrame({
+        "date": dates[valid],
+        "type": types[valid],
+        "weight": weights[valid],
+        "notes": notes[valid],
+    }))
+    rejected = chunk[rejected_mask].assign(reason=reason[rejected_mask])
+    return accepted, rejected
+
+
+def fill_missing_types(chunk: pd.DataFrame, classify: Callable) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Fills blank ``type`` cells by classifying the row's ``notes``.
+
+    ``classify`` takes a list of descriptions and returns (categories,
+    report), like batch_classify.classify_items bound to a model.
+    """
+    if "type" not in chunk.columns:
+        chunk = chunk.assign(type="")
+    if "notes" not in chunk.columns:
+        return chunk, {}
+    types = chunk["type"].fillna("").astype(str).str.strip()
+    notes = chunk["notes"].fillna("").astype(str).str.strip()
+    mask = (types == "") & (notes != "")
+    if not mask.any():
+        return chunk, {}
+    categories, report = classify(notes[mask].tolist())
+    types = types.astype(object)
+    types[mask] = [category or "" for category in categories]
+    return chunk.assign(type=types), report
+
+
+def import_file(
+    store: WasteStore,
+    file,
+    file_format: str,
+    chunk_rows: int = IMPORT_CHUNK_ROWS,
+    classify: Optional[Callable[[List[str]], Tuple[list, Dict[str, Any]]]] = None,
+) -> Dict[str, Any]:
+    """Streams ``file`` into ``store`` chunk by chunk and reports the outcome.
+
+    Only one chunk is held in memory at a time besides the store itself, and
+    at most MAX_REJECTED_SAMPLE rejected rows are kept for the report. With
+    ``classify``, rows without a type get one from their notes first.
+
+    Chunks are committed as they are read, so a failure partway leaves the
+    earlier ones in the log; the ValueError raised then says how many rows
+    were imported.
+    """
+    start = time.perf_counter()
+    rows = imported = 0
+    rejected_samples = []
+    rejected_count = 0
+    classified = {"items": 0, "api_calls": 0, "seconds": 0.0}
+    try:
+        for chunk in iter_chunks(file, file_format, chunk_rows):
+            if classify is not None:
+                chunk, report = fill_missing_types(chunk, classify)
+                for name in classified:
+                    classified[name] += report.get(name, 0)
+            accepted, rejected = validate_chunk(chunk)
+            rows += len(chunk)
+            imported += store.append_frame(accepted)
+            rejected_count += len(rejected)
+            kept = sum(len(sample) for sample in rejected_samples)
+            if kept < MAX_REJECTED_SAMPLE and len(rejected):
+                rejected_samples.append(rejected.head(MAX_REJECTED_SAMPLE - kept))
+    except (ValueError, TypeError) as e:
+        if not imported:
+            raise ValueError(str(e)) from e
+        raise ValueError(f"{e} ({imported:,} row(s) were imported before the failure)") from e
+    return {
+        "rows": rows,
+        "imported": imported,
+        "rejected": rejected_count,
+        "rejected_sample": pd.concat(rejected_samples) if rejected_samples else pd.DataFrame(),
+        "classified": classified,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def iter_csv(frame: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Encodes the log as CSV ``chunk_rows`` rows at a time."""
+    for offset in range(0, max(len(frame), 1), chunk_rows):
+        chunk = frame.iloc[offset:offset + chunk_rows]
+        yield chunk.to_csv(index=False, header=offset == 0, date_format="%Y-%m-%d").encode("utf-8")
+
+
+def export_file(store: WasteStore, file_format: str) -> BinaryIO:
+    """The log as a CSV or Parquet file, encoded EXPORT_CHUNK_ROWS rows at
+    a time into a temporary file (spilled to disk past 16 MB), so no
+    second in-memory copy of the encoded log is built. Streamlit still
+    reads the returned file whole before serving the download."""
+    frame = store.frame()[COLUMNS]
+    file = tempfile.SpooledTemporaryFile(max_size=16 * 2 ** 20)
+    if file_format == "csv":
+        for part in iter_csv(frame):
+            file.write(part)
+    elif file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        schema = pa.Schema.from_pandas(frame, preserve_index=False)
+        with pq.ParquetWriter(file, schema) as writer:
+            for offset in range(0, len(frame), EXPORT_CHUNK_ROWS):
+                chunk = frame.iloc[offset:offset + EXPORT_CHUNK_ROWS]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    else:
+        file.close()
+        raise ValueError(f"Unsupported file format: {file_format}")
+    file.seek(0)
+    return file
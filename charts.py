@@ -0,0 +1,73 @@
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from aggregates import WasteAggregates
+from analytics import TrendSeries
+
+# Days shown on the daily trend; the weekly trend covers the whole log
+DAILY_TREND_DAYS = 180
+
+# Figures are built from pre-aggregated totals and memoized on the store
+# version: reruns that do not write to the log (navigation, chat, ...)
+# reuse the same figure object. Arguments starting with "_" are not hashed.
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def composition_figure(_totals: WasteAggregates, version: int):
+    return px.pie(
+        names=list(_totals.by_type),
+        values=list(_totals.by_type.values()),
+        title='Waste Composition',
+        color_discrete_sequence=px.colors.sequential.RdBu
+    )
+
+
+def _daily_series(totals: WasteAggregates) -> pd.Series:
+    series = pd.Series(totals.by_day, dtype="float64").sort_index()
+    return series.asfreq("D", fill_value=0.0) if len(series) else series
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def trend_figure(_totals: WasteAggregates, version: int, freq: str = "D"):
+    series = _daily_series(_totals)
+    if freq == "D":
+        series = series.iloc[-DAILY_TREND_DAYS:]
+        title = f"Daily Waste (last {DAILY_TREND_DAYS} days)"
+    else:
+        series = series.resample(freq).sum()
+        title = "Weekly Waste"
+    frame = series.rename_axis("date").reset_index(name="weight")
+    fig = px.bar(
+        frame,
+        x="date",
+        y="weight",
+        title=title,
+        labels={"weight": "Weight (kg)", "date": ""},
+        color_discrete_sequence=["#34A853"]
+    )
+    fig.update_layout(bargap=0.1)
+    return fig
+
+
+# Periods of history drawn before the forecast, per granularity
+FORECAST_HISTORY = {"D": 90, "W": 52, "ME": 24}
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def forecast_figure(_series: TrendSeries, version: int, name: str):
+    history = _series.rolling.iloc[-FORECAST_HISTORY[_series.granularity.freq]:]
+    frame = pd.concat([
+        history.melt(ignore_index=False, var_name="type", value_name="weight").assign(kind="Rolling average"),
+        _series.forecast.melt(ignore_index=False, var_name="type", value_name="weight").assign(kind="Forecast"),
+    ]).reset_index()
+    fig = px.line(
+        frame,
+        x="date",
+        y="weight",
+        color="type",
+        line_dash="kind",
+        title=f"{name} Waste by Type: {_series.granularity.rolling_window}-period average and forecast",
+        labels={"weight": "Weight (kg)", "date": "", "type": "Type", "kind": ""},
+    )
+    return fig
@@ -0,0 +1,81 @@
+from typing import Any, Dict, List, Sequence, Union
+
+# Gemini calls the assistant side of a conversation "model"
+_ROLES = {"user": "user", "assistant": "model"}
+# Rough chars-per-token ratio for English text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+SUMMARY_TOPIC_CHARS = 80
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def contents_tokens(contents: Union[str, Sequence[Dict[str, Any]]]) -> int:
+    """Estimated size of a request as built by ``build_contents``."""
+    if isinstance(contents, str):
+        return estimate_tokens(contents)
+    return sum(estimate_tokens(part) for turn in contents for part in turn["parts"] if isinstance(part, str))
+
+
+def _summarize(dropped: Sequence[Dict[str, Any]], budget: int) -> str:
+    """Collapses turns that no longer fit into a one-line recap of the
+    questions the user asked, newest first, trimmed to ``budget`` tokens."""
+    header = "Earlier in this conversation the user asked about: "
+    topics = []
+    used = estimate_tokens(header)
+    for message in reversed(dropped):
+        if message["role"] != "user":
+            continue
+        topic = " ".join(message["content"].split())[:SUMMARY_TOPIC_CHARS]
+        cost = estimate_tokens(topic) + 1
+        if used + cost > budget:
+            break
+        topics.append(topic)
+        used += cost
+    return header + "; ".join(topics) if topics else ""
+
+
+def build_contents(
+    messages: Sequence[Dict[str, Any]],
+    prompt: str,
+    token_budget: int,
+    summary_share: float = 0.2,
+) -> Union[str, List[Dict[str, Any]]]:
+    """Builds the request for ``prompt`` with as much recent history as fits.
+
+    Turns are taken newest first until ``token_budget`` is spent, so the
+    payload stays flat however long the session runs. Older turns are
+    replaced by a short recap limited to ``summary_share`` of the budget.
+    With no prior turns the bare prompt is returned, which keeps first
+    questions eligible for the response cache.
+    """
+    budget = token_budget - estimate_tokens(prompt)
+    history_budget = int(budget * (1 - summary_share))
+    kept = []
+    used = 0
+    cut = len(messages)
+    for index in range(len(messages) - 1, -1, -1):
+        cost = estimate_tokens(messages[index]["content"])
+        if used + cost > history_budget:
+            break
+        used += cost
+        kept.append(messages[index])
+        cut = index
+    kept.reverse()
+    # Gemini expects turns to alternate and the history to open with the user
+    while kept and kept[0]["role"] != "user":
+        kept.pop(0)
+        cut += 1
+
+    contents = []
+    summary = _summarize(messages[:cut], budget - used)
+    if summary:
+        contents.append({"role": "user", "parts": [summary]})
+        contents.append({"role": "model", "parts": ["Understood."]})
+    for message in kept:
+        contents.append({"role": _ROLES[message["role"]], "parts": [message["content"]]})
+    if not contents:
+        return prompt
+    contents.append({"role": "user", "parts": [prompt]})
+    return contents
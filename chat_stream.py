@@ -0,0 +1,48 @@
+import time
+from typing import Any, Dict, Iterator
+
+
+def _chunk_text(chunk) -> str:
+    # Chunks blocked by the safety filters carry no parts and raise on .text
+    try:
+        return chunk.text or ""
+    except ValueError:
+        return ""
+
+
+def stream_response(model, prompt, metrics: Dict[str, Any]) -> Iterator[str]:
+    """Yields the model's reply chunk by chunk as it arrives.
+
+    Timings are written into ``metrics`` while the stream is consumed:
+    ``ttft`` is the time to the first non-empty chunk and ``latency`` the
+    time until the stream is exhausted, both in seconds.
+    """
+    start = time.perf_counter()
+    metrics["ttft"] = None
+    metrics["latency"] = None
+    try:
+        for chunk in model.generate_content(prompt, stream=True):
+            text = _chunk_text(chunk)
+            if not text:
+                continue
+            if metrics["ttft"] is None:
+                metrics["ttft"] = time.perf_counter() - start
+            yield text
+    finally:
+        metrics["latency"] = time.perf_counter() - start
+        if metrics["ttft"] is None:
+            metrics["ttft"] = metrics["latency"]
+
+
+def generate_response(model, prompt, metrics: Dict[str, Any]) -> str:
+    """Blocking counterpart of stream_response with the same metrics."""
+    start = time.perf_counter()
+    text = model.generate_content(prompt).text
+    metrics["latency"] = metrics["ttft"] = time.perf_counter() - start
+    return text
+
+
+def format_timings(message: Dict[str, Any]) -> str:
+    if message.get("latency") is None:
+        return ""
+    return f"⏱️ first token {message['ttft']:.2f}s · total {message['latency']:.2f}s"
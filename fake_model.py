@@ -0,0 +1,125 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Iterator, List, Optional
+
+
+class FakeChunk:
+    """A stand-in for one streamed GenerateContentResponse chunk."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeResponse:
+    """A stand-in for a GenerateContentResponse.
+
+    Iterating over it yields chunks, just like a response returned with
+    ``stream=True``; ``text`` joins them like a non-streamed response.
+    """
+
+    def __init__(self, chunks: List[str], chunk_delay: float = 0.0):
+        self._chunks = chunks
+        self._chunk_delay = chunk_delay
+
+    def __iter__(self) -> Iterator[FakeChunk]:
+        for chunk in self._chunks:
+            if self._chunk_delay:
+                time.sleep(self._chunk_delay)
+            yield FakeChunk(chunk)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+
+class FakeAPIError(Exception):
+    """Mimics a google.api_core error: ``code`` is the HTTP status."""
+
+    def __init__(self, code: int = 503, message: str = "Injected failure"):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeModel:
+    """Offline replacement for ``genai.GenerativeModel``.
+
+    Answers every prompt with ``reply``, ``responder(prompt)`` or an echo
+    of the prompt, split
+    into ``chunk_size``-character chunks that are released every
+    ``chunk_delay`` seconds when streaming. ``first_chunk_delay`` simulates
+    the time the real API takes before the first token arrives.
+
+    Failures can be injected with ``error_rate`` (a fraction of calls that
+    raise FakeAPIError with ``error_code``) or ``errors``, a list of
+    exceptions raised by the first calls in order. ``max_in_flight``
+    records the highest number of concurrent calls seen.
+    """
+
+    def __init__(
+        self,
+        reply: Optional[str] = None,
+        responder: Optional[Callable[[Any], str]] = None,
+        chunk_size: int = 8,
+        chunk_delay: float = 0.0,
+        first_chunk_delay: float = 0.0,
+        model_name: str = "fake-model",
+        error_rate: float = 0.0,
+        error_code: int = 503,
+        errors: Optional[List[Exception]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.reply = reply
+        self.responder = responder
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.first_chunk_delay = first_chunk_delay
+        self.model_name = model_name
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.errors = list(errors or [])
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt) -> str:
+        if self.reply is not None:
+            return self.reply
+        if self.responder is not None:
+            return self.responder(prompt)
+        if isinstance(prompt, list):
+            # Multi-turn contents: answer the latest user turn
+            prompt = prompt[-1]["parts"][0]
+        return f"Echo: {prompt}"
+
+    def _maybe_fail(self):
+        with self._lock:
+            if self.errors:
+                raise self.errors.pop(0)
+            if self.error_rate and self._random.random() < self.error_rate:
+                raise FakeAPIError(self.error_code)
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return self._generate(prompt, stream)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _generate(self, prompt, stream: bool):
+        text = self._answer(prompt)
+        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+        if self.first_chunk_delay:
+            time.sleep(self.first_chunk_delay)
+        self._maybe_fail()
+        if stream:
+            return FakeResponse(chunks, self.chunk_delay)
+        if self.chunk_delay:
+            time.sleep(self.chunk_delay * len(chunks))
+        return FakeResponse(chunks)
@@ -0,0 +1,187 @@
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class Status(str):
+    """A simple-string or error reply ("+OK", "-ERR ..."), as opposed to a
+    bulk string value."""
+
+
+class RespServer:
+    """A stand-in for a Redis server, speaking enough RESP2 for
+    state_backend.RedisStateBackend: strings, hashes, lists and
+    MULTI/EXEC, all in memory and behind one lock.
+
+    ``latency`` seconds are slept before each reply, to model the network
+    hop to a real server. Use it as a context manager, or call ``start``
+    and ``stop``; ``port`` is picked by the OS unless given.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.commands = 0
+        self._data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._clients = set()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            disable_nagle_algorithm = True
+
+            def handle(self):
+                server._clients.add(self.request)
+                try:
+                    self._serve()
+                except OSError:
+                    pass  # the client went away mid-reply
+                finally:
+                    server._clients.discard(self.request)
+
+            def _serve(self):
+                queued: Optional[List[List[str]]] = None
+                while True:
+                    command = server._read_command(self.rfile)
+                    if command is None:
+                        return
+                    name = command[0].upper()
+                    if name == "MULTI":
+                        queued, reply = [], Status("+OK")
+                    elif name == "EXEC" and queued is not None:
+                        with server._lock:
+                            reply = [server._execute(queued_command) for queued_command in queued]
+                        queued = None
+                    elif name == "DISCARD" and queued is not None:
+                        queued, reply = None, Status("+OK")
+                    elif queued is not None:
+                        queued.append(command)
+                        reply = Status("+QUEUED")
+                    else:
+                        with server._lock:
+                            reply = server._execute(command)
+                    if server.latency:
+                        time.sleep(server.latency)
+                    self.wfile.write(server._encode(reply))
+
+        class Server(socketserver.ThreadingTCPServer):
+            # A restarted stand-in can take its old port straight back
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self._server = Server((host, port), Handler)
+        self.host, self.port = self._server.server_address
+        self._thread = None
+
+    def start(self) -> "RespServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops listening and drops every client connection, like a
+        server going down."""
+        self._server.shutdown()
+        self._server.server_close()
+        for client in list(self._clients):
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "RespServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @staticmethod
+    def _read_command(rfile) -> Optional[List[str]]:
+        line = rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.decode().split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(rfile.readline()[1:])
+            args.append(rfile.read(length + 2)[:-2].decode())
+        return args
+
+    @classmethod
+    def _encode(cls, reply) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, list):
+            return b"*%d\r\n" % len(reply) + b"".join(cls._encode(item) for item in reply)
+        if isinstance(reply, Status):
+            return reply.encode() + b"\r\n"
+        data = reply.encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    def _typed(self, key: str, kind: type):
+        value = self._data.get(key)
+        if value is not None and not isinstance(value, kind):
+            raise TypeError
+        return value
+
+    def _execute(self, command: List[str]):
+        self.commands += 1
+        name, args = command[0].upper(), command[1:]
+        try:
+            if name == "PING":
+                return Status("+PONG")
+            if name in ("SELECT", "FLUSHALL"):
+                if name == "FLUSHALL":
+                    self._data.clear()
+                return Status("+OK")
+            if name == "GET":
+                return self._typed(args[0], str)
+            if name == "SET":
+                self._data[args[0]] = args[1]
+                return Status("+OK")
+            if name == "DEL":
+                return sum(self._data.pop(key, None) is not None for key in args)
+            if name == "INCR":
+                value = int(self._typed(args[0], str) or 0) + 1
+                self._data[args[0]] = str(value)
+                return value
+            if name == "HSET":
+                fields = self._data.setdefault(args[0], {})
+                added = sum(field not in fields for field in args[1::2])
+                fields.update(zip(args[1::2], args[2::2]))
+                return added
+            if name == "HGET":
+                return (self._typed(args[0], dict) or {}).get(args[1])
+            if name == "HDEL":
+                fields = self._typed(args[0], dict) or {}
+                return sum(fields.pop(field, None) is not None for field in args[1:])
+            if name == "HGETALL":
+                return [item for pair in (self._typed(args[0], dict) or {}).items() for item in pair]
+            if name == "HMGET":
+                fields = self._typed(args[0], dict) or {}
+                return [fields.get(field) for field in args[1:]]
+            if name == "RPUSH":
+                items = self._data.setdefault(args[0], [])
+                items.extend(args[1:])
+                return len(items)
+            if name == "LLEN":
+                return len(self._typed(args[0], list) or [])
+            if name in ("LRANGE", "LTRIM"):
+                items = self._typed(args[0], list) or []
+                start, stop = int(args[1]), int(args[2])
+                start = max(start + len(items), 0) if start < 0 else start
+                stop = stop + len(items) if stop < 0 else stop
+                kept = items[start:stop + 1]
+                if name == "LRANGE":
+                    return kept
+                self._data[args[0]] = kept
+                return Status("+OK")
+        except TypeError:
+            return Status("-WRONGTYPE Operation against a key holding the wrong kind of value")
+        except (IndexError, ValueError):
+            return Status(f"-ERR wrong arguments for '{name.lower()}' command")
+        return Status(f"-ERR unknown command '{name.lower()}'")
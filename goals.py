@@ -0,0 +1,227 @@
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from state_backend import CachedCollection
+
+if TYPE_CHECKING:
+    from aggregates import WasteAggregates
+
+# Periods a goal is measured over; WasteAggregates keeps weekly and
+# monthly totals per type as entries are logged
+PERIODS = ["Weekly", "Monthly"]
+# Goal kind -> how it reads in the UI. ``target`` is kilograms for the
+# first two and a percentage of the previous period for "reduce"
+AT_LEAST = "at_least"
+AT_MOST = "at_most"
+REDUCE = "reduce"
+GOAL_KINDS = {AT_LEAST: "Collect at least", AT_MOST: "Keep under", REDUCE: "Reduce by"}
+
+COMPLETED = "Completed"
+IN_PROGRESS = "In progress"
+OFF_TRACK = "Off track"
+
+
+def period_start(day, period: str) -> datetime:
+    """Midnight on the Monday of ``day``'s week or the first of its month."""
+    # Imported here: aggregates needs pandas, which the app loads lazily
+    from aggregates import month_start, week_start
+    if period == "Weekly":
+        return week_start(day)
+    if period == "Monthly":
+        return month_start(day)
+    raise ValueError(f"Unknown goal period: {period}")
+
+
+def period_totals(totals: "WasteAggregates", period: str) -> Dict[Tuple[datetime, str], float]:
+    """``totals``' weight per (period start, waste type) for ``period``."""
+    if period == "Weekly":
+        return totals.by_week_type
+    if period == "Monthly":
+        return totals.by_month_type
+    raise ValueError(f"Unknown goal period: {period}")
+
+
+class Goal:
+    """A recurring target for one waste type: collect at least / keep under
+    ``target`` kg per period, or cut the period's weight by ``target``
+    percent against the period before."""
+
+    __slots__ = ("id", "kind", "waste_type", "period", "target", "created")
+
+    def __init__(self, id: int, kind: str, waste_type: str, period: str, target: float, created: date):
+        if kind not in GOAL_KINDS:
+            raise ValueError(f"Unknown goal kind: {kind}")
+        if period not in PERIODS:
+            raise ValueError(f"Unknown goal period: {period}")
+        self.id = id
+        self.kind = kind
+        self.waste_type = waste_type
+        self.period = period
+        self.target = float(target)
+        self.created = created
+
+    def describe(self) -> str:
+        unit = "%" if self.kind == REDUCE else " kg"
+        per = "week" if self.period == "Weekly" else "month"
+        return f"{GOAL_KINDS[self.kind]} {self.target:g}{unit} {self.waste_type} per {per}"
+
+    def __repr__(self) -> str:
+        return f"Goal(id={self.id}, {self.describe()!r})"
+
+
+@dataclass(frozen=True)
+class GoalProgress:
+    """Where ``goal`` stands: this period's weight against its limit (or
+    target), and the previous period's weight."""
+
+    current: float
+    limit: float
+    previous: float
+    status: str
+    goal: Optional[Goal] = None
+
+    @property
+    def fraction(self) -> float:
+        return min(self.current / self.limit, 1.0) if self.limit > 0 else 0.0
+
+
+def evaluate(goal: Goal, totals: "WasteAggregates", today: date) -> GoalProgress:
+    """Progress of ``goal`` from WasteAggregates ``totals``.
+
+    Only the per-period totals of this period and the two before it are
+    read, so the cost does not depend on the size of the log. Goals to
+    collect at least some weight are completed as soon as this period
+    reaches it. Limits can only be judged once a period is over: they are
+    completed when the last full period since the goal was set stayed
+    under its limit, and off track as soon as this period goes over.
+    """
+    by_period = period_totals(totals, goal.period)
+    start = period_start(today, goal.period)
+    previous_start = period_start(start - timedelta(days=1), goal.period)
+    before_start = period_start(previous_start - timedelta(days=1), goal.period)
+    current = by_period.get((start, goal.waste_type), 0.0)
+    previous = by_period.get((previous_start, goal.waste_type), 0.0)
+
+    if goal.kind == AT_LEAST:
+        status = COMPLETED if current >= goal.target else IN_PROGRESS
+        return GoalProgress(current, goal.target, previous, status, goal)
+
+    if goal.kind == AT_MOST:
+        limit, previous_limit = goal.target, goal.target
+    else:
+        before = by_period.get((before_start, goal.waste_type), 0.0)
+        limit = previous * (1 - goal.target / 100)
+        previous_limit = before * (1 - goal.target / 100)
+    if current > limit:
+        status = OFF_TRACK
+    elif goal.created <= previous_start.date() and previous <= previous_limit:
+        status = COMPLETED
+    else:
+        status = IN_PROGRESS
+    return GoalProgress(current, limit, previous, status, goal)
+
+
+def goal_record(goal: Goal) -> Dict[str, Any]:
+    """``goal`` as a JSON-ready record for a state backend."""
+    return {"kind": goal.kind, "waste_type": goal.waste_type, "period": goal.period, "target": goal.target,
+            "created": goal.created.isoformat()}
+
+
+def goal_from_record(goal_id: int, record: Dict[str, Any]) -> Goal:
+    return Goal(goal_id, **{**record, "created": date.fromisoformat(record["created"])})
+
+
+class GoalStore:
+    """A site's goals, with their progress cached per log version.
+
+    ``progress`` re-evaluates every goal only when the waste log, the goal
+    list or the day has changed since the last call. With ``shared`` (a
+    state_backend.CachedCollection) goals are kept in the state backend,
+    as ScheduleStore keeps schedules. ``version`` changes with every add
+    and delete, and a lock makes the store safe to share between sessions.
+    """
+
+    def __init__(self, shared: Optional[CachedCollection] = None):
+        self._next_id = 1
+        self._by_id: Dict[int, Goal] = {}
+        self._version = 0
+        self._progress_key = None
+        self._progress: Dict[int, GoalProgress] = {}
+        self._shared = shared
+        if shared is None:
+            self._lock = threading.RLock()
+            return
+        self._lock = shared.lock
+        with self._lock:
+            records = shared.records()
+            shared.on_change = self._apply
+            self._apply(dict(sorted(records.items())))
+
+    @property
+    def version(self) -> int:
+        self._sync()
+        return self._version
+
+    def _sync(self):
+        if self._shared is not None:
+            self._shared.sync()
+
+    def _apply(self, changes: Dict[int, Optional[Dict[str, Any]]]):
+        for goal_id, record in changes.items():
+            if record is None:
+                self._by_id.pop(goal_id, None)
+            else:
+                self._by_id[goal_id] = goal_from_record(goal_id, record)
+        self._version += 1
+
+    def add(self, goal: Dict[str, Any]) -> Goal:
+        with self._lock:
+            goal = Goal(0, **{"created": date.today(), **goal})
+            if self._shared is None:
+                goal.id = self._next_id
+                self._next_id += 1
+            else:
+                goal.id = self._shared.put(goal_record(goal))
+            self._by_id[goal.id] = goal
+            self._version += 1
+        return goal
+
+    def get(self, goal_id: int) -> Optional[Goal]:
+        self._sync()
+        return self._by_id.get(goal_id)
+
+    def delete(self, goal_id: int) -> bool:
+        with self._lock:
+            self._sync()
+            if goal_id not in self._by_id:
+                return False
+            if self._shared is not None:
+                self._shared.delete(goal_id)
+            del self._by_id[goal_id]
+            self._version += 1
+        return True
+
+    def progress(self, store, today: Optional[date] = None) -> Dict[int, GoalProgress]:
+        """Goal id -> GoalProgress against the WasteStore ``store``, for
+        the goals as of one sync; each result carries its goal."""
+        today = today or date.today()
+        with self._lock:
+            key = (store.version, self.version, today)
+            if key != self._progress_key:
+                totals = store.aggregates_snapshot()
+                self._progress = {goal.id: evaluate(goal, totals, today) for goal in self._by_id.values()}
+                self._progress_key = key
+            return self._progress
+
+    def completed(self, store, today: Optional[date] = None) -> int:
+        return sum(progress.status == COMPLETED for progress in self.progress(store, today).values())
+
+    def __iter__(self):
+        self._sync()
+        return iter(list(self._by_id.values()))
+
+    def __len__(self) -> int:
+        self._sync()
+        return len(self._by_id)
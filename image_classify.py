@@ -0,0 +1,236 @@
+import io
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from batch_classify import JSON_CONFIG, MAX_PARALLEL_BATCHES, canonical_type, parse_rows
+from instrumentation import METRICS
+from waste_store import WASTE_TYPES
+
+# Longest side, in pixels, of the copy sent to the model; identifying an
+# item needs nowhere near a phone camera's 4000 px
+MAX_SIDE = 768
+JPEG_QUALITY = 80
+IMAGES_PER_REQUEST = 8
+# Photos whose 64-bit difference hashes differ in at most this many bits
+# are taken to show the same item
+HASH_DISTANCE = 6
+
+
+@dataclass
+class PreparedImage:
+    """A photo downscaled and re-encoded for upload."""
+
+    data: bytes
+    original_bytes: int
+    size: Tuple[int, int]
+    hash: int
+    prepare_seconds: float
+
+    @property
+    def part(self) -> Dict[str, Any]:
+        # Inline blob, as accepted in a generate_content parts list
+        return {"mime_type": "image/jpeg", "data": self.data}
+
+
+@dataclass
+class Identification:
+    """What the model (or the cache) said about one photo."""
+
+    item: str
+    category: Optional[str]
+    disposal: str
+    cached: bool = False
+    original_bytes: int = 0
+    sent_bytes: int = 0
+    prepare_ms: float = 0.0
+    latency_ms: float = 0.0
+
+
+def difference_hash(image: Image.Image) -> int:
+    """64-bit dHash: each bit says whether a pixel of a 9x8 grayscale
+    thumbnail is brighter than its right-hand neighbour. Resizing,
+    re-encoding and small lighting changes flip few bits."""
+    pixels = np.asarray(image.convert("L").resize((9, 8), Image.Resampling.BILINEAR), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def prepare_image(data: bytes, max_side: int = MAX_SIDE, quality: int = JPEG_QUALITY) -> PreparedImage:
+    """Downscales ``data`` (any format Pillow reads) to at most ``max_side``
+    pixels on its longest side and re-encodes it as JPEG. Camera JPEGs are
+    decoded at reduced scale to begin with (``draft``), which is most of
+    the saving on large photos."""
+    start = time.perf_counter()
+    image = Image.open(io.BytesIO(data))
+    image.draft("RGB", (max_side, max_side))
+    image = ImageOps.exif_transpose(image).convert("RGB")
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return PreparedImage(
+        data=buffer.getvalue(),
+        original_bytes=len(data),
+        size=image.size,
+        hash=difference_hash(image),
+        prepare_seconds=time.perf_counter() - start,
+    )
+
+
+class ImageHashCache:
+    """Identifications keyed by perceptual hash, LRU-bounded.
+
+    Hashes sit in a NumPy array so a lookup is one vectorised XOR and
+    popcount against every entry; the closest one within ``max_distance``
+    bits wins. Shared between sessions, so it is locked.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_distance: int = HASH_DISTANCE):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._hashes = np.zeros(max_entries, dtype=np.uint64)
+        self._entries: "OrderedDict[int, Identification]" = OrderedDict()  # slot in _hashes -> result
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, image_hash: int) -> Optional[Identification]:
+        with self._lock:
+            if self._entries:
+                slots = np.fromiter(self._entries, dtype=np.int64, count=len(self._entries))
+                xor = self._hashes[slots] ^ np.uint64(image_hash)
+                distances = np.unpackbits(xor.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+                best = int(np.argmin(distances))
+                if distances[best] <= self.max_distance:
+                    slot = int(slots[best])
+                    self._entries.move_to_end(slot)
+                    self.hits += 1
+                    return self._entries[slot]
+            self.misses += 1
+            return None
+
+    def put(self, image_hash: int, result: Identification):
+        with self._lock:
+            if len(self._entries) < self.max_entries:
+                slot = len(self._entries)
+            else:
+                slot, _ = self._entries.popitem(last=False)
+            self._hashes[slot] = np.uint64(image_hash)
+            self._entries[slot] = result
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0, "size": len(self)}
+
+
+def build_prompt(count: int) -> str:
+    return (
+        f"Each of the {count} photos that follow shows one waste item; photo 0 comes first. "
+        f"Identify the item in each photo and classify it into exactly one category from {WASTE_TYPES}.\n"
+        'Reply with a JSON array of objects {"index": <photo number>, "item": <short name>, '
+        '"category": <category>, "disposal": <one sentence on how to dispose of it>}, '
+        "one per photo, and nothing else."
+    )
+
+
+def _identify_batch(model, images: Sequence[PreparedImage]) -> Tuple[List[Optional[Identification]], float]:
+    start = time.perf_counter()
+    response = model.generate_content(
+        [build_prompt(len(images)), *(image.part for image in images)],
+        generation_config=JSON_CONFIG,
+    )
+    seconds = time.perf_counter() - start
+    METRICS.observe("model_call_seconds", seconds, mode="image")
+    results = [
+        Identification(
+            item=str(row.get("item") or "Unknown item"),
+            category=canonical_type(row.get("category")),
+            disposal=str(row.get("disposal") or ""),
+        ) if row else None
+        for row in parse_rows(response.text, len(images))
+    ]
+    return results, seconds
+
+
+def identify_images(
+    model,
+    photos: Sequence[bytes],
+    cache: Optional[ImageHashCache] = None,
+    images_per_request: int = IMAGES_PER_REQUEST,
+    max_parallel: int = MAX_PARALLEL_BATCHES,
+    max_side: int = MAX_SIDE,
+    quality: int = JPEG_QUALITY,
+) -> Tuple[List[Optional[Identification]], Dict[str, Any]]:
+    """Identifies the waste item in each photo with as few, and as small,
+    model requests as possible.
+
+    Photos are downscaled and re-encoded, looked up in ``cache`` by
+    perceptual hash, and the misses sent ``images_per_request`` to a
+    request, ``max_parallel`` requests at a time. Returns one
+    Identification (or None for unreadable files and photos the model gave
+    no usable answer for) per photo, each with its payload sizes and latency (a
+    batch's latency split evenly between its photos), plus a report of
+    the totals.
+    """
+    start = time.perf_counter()
+    prepared: List[Optional[PreparedImage]] = []
+    for photo in photos:
+        try:
+            prepared.append(prepare_image(photo, max_side, quality))
+        except (OSError, ValueError):  # not an image Pillow can read
+            prepared.append(None)
+    results: List[Optional[Identification]] = [None] * len(prepared)
+    misses = []
+    for index, image in enumerate(prepared):
+        hit = cache.get(image.hash) if cache is not None and image is not None else None
+        if hit is not None:
+            results[index] = Identification(hit.item, hit.category, hit.disposal, cached=True)
+        elif image is not None:
+            misses.append(index)
+
+    batches = [misses[i:i + images_per_request] for i in range(0, len(misses), images_per_request)]
+    failed_batches = 0
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        futures = [pool.submit(_identify_batch, model, [prepared[index] for index in batch]) for batch in batches]
+        for batch, future in zip(batches, futures):
+            try:
+                found, seconds = future.result()
+            except Exception:
+                failed_batches += 1
+                continue
+            for index, result in zip(batch, found):
+                if result is None:
+                    continue
+                result.latency_ms = 1000 * seconds / len(batch)
+                results[index] = result
+                if cache is not None and result.category is not None:
+                    cache.put(prepared[index].hash, result)
+
+    for image, result in zip(prepared, results):
+        if result is not None:
+            result.original_bytes = image.original_bytes
+            result.sent_bytes = 0 if result.cached else len(image.data)
+            result.prepare_ms = 1000 * image.prepare_seconds
+    original = sum(image.original_bytes for image in prepared if image is not None)
+    sent = sum(len(prepared[index].data) for index in misses)
+    METRICS.inc("image_bytes_total", original, stage="uploaded")
+    METRICS.inc("image_bytes_total", sent, stage="sent")
+    return results, {
+        "images": len(prepared),
+        "unreadable": sum(image is None for image in prepared),
+        "cached": sum(result is not None and result.cached for result in results),
+        "api_calls": len(batches),
+        "failed_batches": failed_batches,
+        "original_bytes": original,
+        "sent_bytes": sent,
+        "seconds": time.perf_counter() - start,
+    }
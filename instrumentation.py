@@ -0,0 +1,206 @@
+import bisect
+import contextlib
+import functools
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+PREFIX = "waste_ai_"
+# Upper bounds in seconds: 1 ms to ~65 s, doubling, so every bucket has the
+# same relative error
+BUCKETS = tuple(0.001 * 2 ** i for i in range(17))
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Histogram:
+    """Fixed-bucket latency histogram: O(1) memory and O(log buckets) per
+    observation. Quantiles are interpolated within the bucket they fall
+    in, the same estimate Prometheus' histogram_quantile makes."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+
+class Metrics:
+    """Process-wide registry of latency histograms, counters and gauges.
+
+    Histograms and counters are keyed by name and labels. Gauges come from
+    collectors, callables registered under a key and polled on export, so
+    figures owned by other objects (cache hit rates, ...) are read only
+    when someone looks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self._collectors: Dict[str, Callable[[], Dict[Tuple[str, Labels], float]]] = {}
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name: str, **labels):
+        """Decorator form of ``timer``."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def counter_values(self) -> Dict[Tuple[str, Labels], float]:
+        with self._lock:
+            return dict(self.counters)
+
+    def register_collector(self, key: str, collect: Callable[[], Dict[Tuple[str, Labels], float]]):
+        """Registers (or replaces) the gauge source stored under ``key``."""
+        with self._lock:
+            self._collectors[key] = collect
+
+    def gauges(self) -> Dict[Tuple[str, Labels], float]:
+        with self._lock:
+            collectors = list(self._collectors.values())
+        gauges = {}
+        for collect in collectors:
+            try:
+                gauges.update(collect())
+            except Exception:  # a broken collector must not break the export
+                pass
+        return gauges
+
+    def summary(self, quantiles=(0.5, 0.95, 0.99)) -> List[Dict[str, Any]]:
+        """One dict per histogram with count, mean and the given quantiles,
+        all in seconds."""
+        with self._lock:
+            items = sorted(self.histograms.items())
+            return [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                    **{f"p{round(q * 100)}": histogram.quantile(q) for q in quantiles},
+                    "max": histogram.max,
+                }
+                for (name, labels), histogram in items
+            ]
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+            typed = set()
+            for (name, labels), histogram in histograms:
+                metric = PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                cumulative = 0
+                for bound, count in zip([*histogram.buckets, "+Inf"], histogram.counts):
+                    cumulative += count
+                    le = bound if isinstance(bound, str) else f"{bound:g}"
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+            for (name, labels), value in counters:
+                metric = PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        for (name, labels), value in sorted(self.gauges().items()):
+            metric = PREFIX + name
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} gauge")
+                typed.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def to_json_lines(self, timestamp: Optional[float] = None) -> str:
+        """One JSON object per series, histograms summarised as quantiles."""
+        timestamp = time.time() if timestamp is None else timestamp
+        rows = [dict(row, type="histogram") for row in self.summary()]
+        counters = sorted(self.counter_values().items())
+        rows += [{"name": name, "labels": dict(labels), "type": "counter", "value": value} for (name, labels), value in counters]
+        rows += [{"name": name, "labels": dict(labels), "type": "gauge", "value": value} for (name, labels), value in sorted(self.gauges().items())]
+        return "".join(json.dumps(dict(row, timestamp=timestamp)) + "\n" for row in rows)
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+def cache_gauges(cache, name: str) -> Dict[Tuple[str, Labels], float]:
+    """Hit rate of any cache with a ``stats()`` dict."""
+    return {("cache_hit_ratio", _labels({"cache": name})): cache.stats()["hit_rate"]}
+
+
+def model_gauges(model) -> Dict[Tuple[str, Labels], float]:
+    """Hit rates of the caches and the local classifier in front of ``model``."""
+    gauges = {}
+    cache = getattr(model, "cache", None)
+    if cache is not None:
+        gauges.update(cache_gauges(cache, "response"))
+    semantic_cache = getattr(model, "semantic_cache", None)
+    if semantic_cache is not None:
+        gauges.update(cache_gauges(semantic_cache, "semantic"))
+    if hasattr(model, "report"):
+        gauges["cache_hit_ratio", _labels({"cache": "local"})] = model.report()["hit_rate"]
+    return gauges
+
+
+# Shared by every session of the process
+METRICS = Metrics()
@@ -0,0 +1,202 @@
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Keywords per category. Multi-word phrases outweigh single words, so
+# "pizza box" beats "box" and "phone battery" stays ambiguous.
+KEYWORDS = {
+    "Recyclables": [
+        "bottle", "plastic bottle", "water bottle", "soda can", "tin can", "aluminum", "aluminium",
+        "cardboard", "paper", "newspaper", "magazine", "glass", "jar", "carton", "milk jug",
+        "cereal box", "steel", "foil", "envelope", "junk mail",
+    ],
+    "Organic": [
+        "banana", "peel", "apple core", "food", "leftovers", "coffee grounds", "tea bag", "eggshell",
+        "vegetable", "fruit", "grass", "leaves", "yard waste", "bread", "rice", "bones", "orange",
+    ],
+    "Hazardous": [
+        "battery", "paint", "pesticide", "motor oil", "chemical", "bleach", "solvent", "aerosol",
+        "needle", "syringe", "medicine", "thermometer", "mercury", "fluorescent", "propane", "antifreeze",
+    ],
+    "E-Waste": [
+        "phone", "smartphone", "laptop", "computer", "charger", "cable", "tv", "television",
+        "monitor", "printer", "keyboard", "tablet", "headphones", "electronics", "router", "console",
+    ],
+    "General": [
+        "diaper", "chip bag", "styrofoam", "polystyrene", "straw", "wrapper", "ceramic", "sock",
+        "tissue", "napkin", "cigarette", "gum", "pizza box", "coffee cup", "plastic bag", "mirror", "paper towel",
+    ],
+}
+
+GUIDANCE = {
+    "Recyclables": "♻️ Put it in the **recycling** bin. Rinse off food residue, flatten boxes and keep lids on bottles.",
+    "Organic": "🌱 This is **organic** waste. Compost it or use the green/food waste bin.",
+    "Hazardous": "⚠️ This is **hazardous** waste. Never bin it; take it to a hazardous waste drop-off point.",
+    "E-Waste": "🔌 This is **e-waste**. Take it to an electronics recycling point or a retailer take-back scheme, and wipe personal data first.",
+    "General": "🗑️ This goes in **general** waste. Look for reusable alternatives to cut down on it.",
+}
+
+# Only questions about where an item goes are answered locally. Each
+# pattern must match the whole question, and only the item it captures is
+# classified, so "why is recycling glass important?" goes to the model.
+_DISPOSE = r"(?:throw away|throw out|get rid of|dispose of|recycle|compost|bin|put|toss)"
+_DISPOSAL_QUESTIONS = [re.compile(pattern) for pattern in (
+    # "where does leftover paint go?", "what bin does a coffee cup go in?"
+    r"(?:where|what bin|which bin) (?:do|does|should|can|would) (?P<item>.+?) (?:go|belong)(?: in| into)?",
+    # "where do I throw away a banana peel?", "how should I dispose of an old phone?"
+    rf"(?:where|how) (?:do|should|can|would) (?:i|you|we) {_DISPOSE} (?P<item>.+?)(?: away| out)?",
+    # "can I recycle glass jars?", "can I compost eggshells and coffee grounds?"
+    rf"(?:can|should) (?:i|you|we) {_DISPOSE} (?P<item>.+?)(?: in (?:the )?[a-z]+(?: bin)?)?",
+    # "is a pizza box recyclable?", "are aluminum cans recyclable?"
+    r"(?:is|are) (?P<item>.+?) (?:recyclable|compostable|hazardous( waste)?|e-waste)",
+    # "what bin is a coffee cup?", "which category are batteries in?"
+    r"(?:what|which) (?:bin|category) (?:is|are) (?P<item>.+?)(?: in)?",
+)]
+# Longer captures are sentences, not an item name
+MAX_ITEM_WORDS = 6
+_WORD = re.compile(r"[a-z\-]+")
+PHRASE_WEIGHT = 2.0
+CONFIDENCE_THRESHOLD = 0.75
+
+
+def _singular(word: str) -> str:
+    # Fold simple plurals so "bottles" hits "bottle" and "batteries" "battery"
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _tokens(text: str) -> List[str]:
+    return [_singular(word) for word in _WORD.findall(text.lower())]
+
+
+def disposal_item(question: str) -> Optional[str]:
+    """The item a "where does X go" question asks about, or None when the
+    question is about anything else."""
+    question = " ".join(question.lower().split()).rstrip("?!. ")
+    for pattern in _DISPOSAL_QUESTIONS:
+        match = pattern.fullmatch(question)
+        if match and len(match["item"].split()) <= MAX_ITEM_WORDS:
+            return match["item"]
+    return None
+
+
+class LocalClassifier:
+    """Keyword index over KEYWORDS that labels an item description.
+
+    Single words and two-word phrases are looked up in dicts, so a query
+    costs O(words) regardless of the vocabulary size.
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]] = KEYWORDS, threshold: float = CONFIDENCE_THRESHOLD):
+        self.threshold = threshold
+        self._index: Dict[Tuple[str, ...], Dict[str, float]] = defaultdict(dict)
+        for category, terms in keywords.items():
+            for term in terms:
+                key = tuple(_tokens(term))
+                self._index[key][category] = PHRASE_WEIGHT if len(key) > 1 else 1.0
+
+    def classify(self, text: str) -> Tuple[Optional[str], float]:
+        """Returns (category, confidence); confidence is the top category's
+        share of all matched weight, 0.0 when nothing matched."""
+        tokens = _tokens(text)
+        scores: Dict[str, float] = defaultdict(float)
+        skip = set()
+        for i in range(len(tokens) - 1):
+            for category, weight in self._index.get((tokens[i], tokens[i + 1]), {}).items():
+                scores[category] += weight
+                skip.update((i, i + 1))
+        for i, token in enumerate(tokens):
+            if i in skip:
+                continue
+            for category, weight in self._index.get((token,), {}).items():
+                scores[category] += weight
+        if not scores:
+            return None, 0.0
+        category = max(scores, key=scores.get)
+        return category, scores[category] / sum(scores.values())
+
+    def answer(self, question: str) -> Optional[str]:
+        """A canned answer when ``question`` asks where an item goes and the
+        item is recognised with enough confidence, otherwise None."""
+        item = disposal_item(question)
+        if item is None:
+            return None
+        category, confidence = self.classify(item)
+        if category is None or confidence < self.threshold:
+            return None
+        return f"{GUIDANCE[category]}\n\n_Answered locally · category: {category}_"
+
+
+class LocalResponse:
+    """A locally produced reply, usable as a plain or a streamed response."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __iter__(self):
+        yield self
+
+
+OFFLINE_REPLY = (
+    "🔌 The AI assistant is offline (no API key configured). I can still tell you "
+    "where common items go: try asking e.g. *\"how do I recycle batteries?\"*"
+)
+
+
+def _latest_question(prompt) -> Optional[str]:
+    if isinstance(prompt, str):
+        return prompt
+    if isinstance(prompt, list) and prompt and isinstance(prompt[-1], dict):
+        parts = prompt[-1].get("parts") or [""]
+        return parts[0] if isinstance(parts[0], str) else None
+    return None
+
+
+class LocalFirstModel:
+    """Answers common "where does X go" questions locally and forwards the
+    rest to ``model``. With ``model`` set to None (no API key) everything
+    the classifier cannot answer gets OFFLINE_REPLY.
+    """
+
+    def __init__(self, model, classifier: Optional[LocalClassifier] = None):
+        self.model = model
+        self.classifier = classifier or LocalClassifier()
+        self.model_name = getattr(model, "model_name", "local")
+        self._lock = threading.Lock()
+        self.stats = {"local": 0, "forwarded": 0, "local_seconds": 0.0}
+
+    def __getattr__(self, name):
+        if self.model is None:
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        question = None if kwargs else _latest_question(prompt)
+        if question is not None:
+            start = time.perf_counter()
+            text = self.classifier.answer(question)
+            elapsed = time.perf_counter() - start
+            if text is not None:
+                with self._lock:
+                    self.stats["local"] += 1
+                    self.stats["local_seconds"] += elapsed
+                return LocalResponse(text)
+        with self._lock:
+            self.stats["forwarded"] += 1
+        if self.model is None:
+            return LocalResponse(OFFLINE_REPLY)
+        return self.model.generate_content(prompt, stream=stream, **kwargs)
+
+    def report(self) -> Dict[str, float]:
+        total = self.stats["local"] + self.stats["forwarded"]
+        return {
+            "local": self.stats["local"],
+            "forwarded": self.stats["forwarded"],
+            "hit_rate": self.stats["local"] / total if total else 0.0,
+            "avg_local_ms": 1000 * self.stats["local_seconds"] / self.stats["local"] if self.stats["local"] else 0.0,
+        }
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterator
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+# Weeks between collections; Monthly collections fall on the first
+# matching weekday of each month instead
+FREQUENCY_WEEKS = {"Weekly": 1, "Bi-weekly": 2, "Monthly": None}
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """When a collection repeats: a weekday and time of day, a frequency
+    from FREQUENCY_WEEKS, and the date the schedule was created from."""
+
+    __slots__ = ("weekday", "at", "frequency", "anchor")
+
+    weekday: int
+    at: time
+    frequency: str
+    anchor: date
+
+    @classmethod
+    def from_schedule(cls, day: str, at: time, frequency: str, anchor: date) -> "Recurrence":
+        if frequency not in FREQUENCY_WEEKS:
+            raise ValueError(f"Unknown frequency: {frequency}")
+        return cls(WEEKDAYS.index(day), at, frequency, anchor)
+
+    def to_record(self) -> Dict[str, Any]:
+        return {"weekday": self.weekday, "at": self.at.isoformat(), "frequency": self.frequency,
+                "anchor": self.anchor.isoformat()}
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Recurrence":
+        return cls(record["weekday"], time.fromisoformat(record["at"]), record["frequency"],
+                   date.fromisoformat(record["anchor"]))
+
+    def first(self) -> datetime:
+        offset = (self.weekday - self.anchor.weekday()) % 7
+        return datetime.combine(self.anchor + timedelta(days=offset), self.at)
+
+    def _monthly(self, year: int, month: int) -> datetime:
+        first_of_month = date(year, month, 1)
+        offset = (self.weekday - first_of_month.weekday()) % 7
+        return datetime.combine(first_of_month + timedelta(days=offset), self.at)
+
+    def next_after(self, moment: datetime) -> datetime:
+        """The first occurrence at or after ``moment``."""
+        first = self.first()
+        if moment <= first:
+            moment = first
+        weeks = FREQUENCY_WEEKS[self.frequency]
+        if weeks is None:
+            year, month = moment.year, moment.month
+            occurrence = self._monthly(year, month)
+            while occurrence < moment or occurrence < first:
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+                occurrence = self._monthly(year, month)
+            return occurrence
+        period = timedelta(weeks=weeks)
+        periods = -(-(moment - first) // period)
+        return first + periods * period
+
+    def occurrences(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Every occurrence in ``[start, end)``."""
+        occurrence = self.next_after(start)
+        weeks = FREQUENCY_WEEKS[self.frequency]
+        while occurrence < end:
+            yield occurrence
+            if weeks is None:
+                occurrence = self.next_after(occurrence + timedelta(days=1))
+            else:
+                occurrence += timedelta(weeks=weeks)
@@ -0,0 +1,174 @@
+import functools
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Folds case, whitespace and trailing punctuation so trivially different
+    spellings of the same question share a cache entry."""
+    return _WHITESPACE.sub(" ", prompt).strip().rstrip("?!. ").lower()
+
+
+def make_key(prompt: str, model_name: str, generation_config: Dict[str, Any]) -> str:
+    config = json.dumps(generation_config or {}, sort_keys=True, default=str)
+    raw = "\x1f".join([model_name, config, normalize_prompt(prompt)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of model replies with an optional TTL.
+
+    Entries live in memory; when ``path`` is given they are also written to
+    an SQLite file so they survive process restarts. ``max_entries`` bounds
+    both the in-memory map and the on-disk table.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: Optional[float] = None, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created > self.ttl_seconds
+
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT text, created FROM responses WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+                if entry is not None:
+                    self._entries[key] = entry
+            if entry is None or self._expired(entry[1]):
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, text: str):
+        created = time.time()
+        with self._lock:
+            self._entries[key] = (text, created)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, text, created) VALUES (?, ?, ?)",
+                    (key, text, created),
+                )
+                self._db.execute(
+                    "DELETE FROM responses WHERE key NOT IN "
+                    "(SELECT key FROM responses ORDER BY created DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+                self._db.commit()
+
+    def _discard(self, key: str):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+def record_stream(response, on_complete: Callable[[str], None]) -> Iterator:
+    """Passes ``response``'s chunks through and hands the joined text to
+    ``on_complete`` once the stream is exhausted. An abandoned stream is not
+    a full reply, so nothing is recorded for it."""
+    parts = []
+    for chunk in response:
+        try:
+            parts.append(chunk.text or "")
+        except ValueError:
+            pass  # chunks blocked by the safety filters carry no text
+        yield chunk
+    text = "".join(parts)
+    if text:
+        on_complete(text)
+
+
+class CachedResponse:
+    """Replays a cached reply as either a plain or a streamed response."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.cached = True
+
+    def __iter__(self):
+        yield self
+
+
+class CachedModel:
+    """Wraps a GenerativeModel and answers repeated prompts from a ResponseCache.
+
+    Only plain-text prompts without per-call overrides are cached; anything
+    else is passed straight through to the wrapped model.
+    """
+
+    def __init__(self, model, cache: ResponseCache, generation_config: Dict[str, Any]):
+        self.model = model
+        self.cache = cache
+        self.generation_config = generation_config
+        self.model_name = getattr(model, "model_name", type(model).__name__)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        if not isinstance(prompt, str) or kwargs:
+            return self.model.generate_content(prompt, stream=stream, **kwargs)
+        key = make_key(prompt, self.model_name, self.generation_config)
+        text = self.cache.get(key)
+        if text is not None:
+            return CachedResponse(text)
+        response = self.model.generate_content(prompt, stream=stream)
+        if stream:
+            return record_stream(response, functools.partial(self.cache.put, key))
+        if response.text:
+            self.cache.put(key, response.text)
+        return response
@@ -0,0 +1,240 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from recurrence import FREQUENCY_WEEKS, WEEKDAYS
+
+# Collection days the planner spreads load over
+WORKDAYS = WEEKDAYS[:5]
+EARTH_RADIUS_KM = 6371.0
+# A day may carry this much more than the average day before stops are
+# moved off it
+BALANCE_TOLERANCE = 0.1
+# Weeks of waste a collection picks up; monthly ones are 52 / 12 weeks apart
+COLLECTION_WEEKS = {frequency: weeks or 52 / 12 for frequency, weeks in FREQUENCY_WEEKS.items()}
+
+
+@dataclass
+class Stop:
+    """One collection: where, how much (kg), and the weekday it is booked
+    on. ``ref`` is whatever the caller needs to map it back (site, schedule)."""
+
+    name: str
+    lat: float
+    lon: float
+    volume: float
+    day: str
+    ref: Any = None
+
+
+@dataclass
+class Trip:
+    """Stops one truck visits between leaving and returning to the depot,
+    in visiting order (indices into the planned stops)."""
+
+    stops: List[int]
+    load: float
+    distance_km: float
+
+
+@dataclass
+class DayPlan:
+    day: str
+    trips: List[Trip] = field(default_factory=list)
+
+    @property
+    def load(self) -> float:
+        return sum(trip.load for trip in self.trips)
+
+    @property
+    def distance_km(self) -> float:
+        return sum(trip.distance_km for trip in self.trips)
+
+    @property
+    def stops(self) -> int:
+        return sum(len(trip.stops) for trip in self.trips)
+
+
+@dataclass
+class RoutePlan:
+    """Trips per workday, the day each stop ended up on, and timings."""
+
+    days: List[DayPlan]
+    assigned: List[str]
+    moved: int
+    seconds: float
+
+
+def distance_matrix(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km between every pair of points."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def project(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Equirectangular x/y in km; accurate enough at city scale for
+    centroids and nearness."""
+    x = np.radians(lon) * np.cos(np.radians(np.mean(lat))) * EARTH_RADIUS_KM
+    return np.column_stack([x, np.radians(lat) * EARTH_RADIUS_KM])
+
+
+def balance_days(points: np.ndarray, volumes: np.ndarray, days: np.ndarray,
+                 tolerance: float = BALANCE_TOLERANCE) -> np.ndarray:
+    """Moves stops off days loaded more than ``tolerance`` above the mean.
+
+    While the heaviest day is over the limit, the stop on it nearest to the
+    lightest day's centroid (among those small enough to make the move an
+    improvement) goes to the lightest day, so days stay geographically
+    compact. ``days`` are indices into WORKDAYS; returns the new ones.
+    """
+    days = days.copy()
+    loads = np.bincount(days, weights=volumes, minlength=len(WORKDAYS))
+    limit = loads.sum() / len(WORKDAYS) * (1 + tolerance)
+    while True:
+        heavy, light = int(np.argmax(loads)), int(np.argmin(loads))
+        if loads[heavy] <= limit:
+            break
+        members = np.flatnonzero(days == heavy)
+        members = members[volumes[members] < loads[heavy] - loads[light]]
+        if not len(members):
+            break
+        on_light = days == light
+        centroid = points[on_light].mean(axis=0) if on_light.any() else points.mean(axis=0)
+        stop = members[np.argmin(((points[members] - centroid) ** 2).sum(axis=1))]
+        days[stop] = light
+        loads[heavy] -= volumes[stop]
+        loads[light] += volumes[stop]
+    return days
+
+
+def nearest_neighbour(dist: np.ndarray) -> np.ndarray:
+    """Closed tour from node 0 (the depot) always visiting the nearest
+    unvisited node next; O(n^2) with one vectorised argmin per step."""
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    tour = np.zeros(n + 1, dtype=np.int64)
+    current = 0
+    for step in range(1, n):
+        row = np.where(visited, np.inf, dist[current])
+        current = int(np.argmin(row))
+        visited[current] = True
+        tour[step] = current
+    return tour
+
+
+def two_opt(tour: np.ndarray, dist: np.ndarray, max_passes: int = 50) -> np.ndarray:
+    """Reverses tour segments while that shortens the tour.
+
+    Each pass walks the edges (a, b) in order and scores swapping it with
+    every later edge (c, d) in one vectorised step, applying the best
+    improvement; it stops after a pass with none. Both ends stay fixed.
+    """
+    tour = tour.copy()
+    n = len(tour)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 3):
+            a, b = tour[i], tour[i + 1]
+            c, d = tour[i + 2:n - 1], tour[i + 3:n]
+            gains = dist[a, b] + dist[c, d] - dist[a, c] - dist[b, d]
+            j = int(np.argmax(gains))
+            if gains[j] > 1e-9:
+                tour[i + 1:i + j + 3] = tour[i + 1:i + j + 3][::-1]
+                improved = True
+        if not improved:
+            break
+    return tour
+
+
+def tour_length(tour: np.ndarray, dist: np.ndarray) -> float:
+    return float(dist[tour[:-1], tour[1:]].sum())
+
+
+def split_trips(tour: np.ndarray, volumes: np.ndarray, capacity: Optional[float]) -> List[np.ndarray]:
+    """Cuts a depot-to-depot tour into trips of at most ``capacity`` kg
+    each, in tour order. A stop heavier than a whole truck gets a trip of
+    its own."""
+    stops = tour[1:-1]
+    if capacity is None or not len(stops):
+        return [stops] if len(stops) else []
+    trips, start, load = [], 0, 0.0
+    for index, stop in enumerate(stops):
+        if load and load + volumes[stop] > capacity:
+            trips.append(stops[start:index])
+            start, load = index, 0.0
+        load += volumes[stop]
+    trips.append(stops[start:])
+    return trips
+
+
+def route_day(lat: np.ndarray, lon: np.ndarray, volumes: np.ndarray,
+              capacity: Optional[float]) -> List[Tuple[np.ndarray, float]]:
+    """Trips for one day's stops; node 0 of ``lat``/``lon``/``volumes`` is
+    the depot. Returns (stops in visiting order, km) per trip."""
+    dist = distance_matrix(lat, lon)
+    tour = two_opt(nearest_neighbour(dist), dist)
+    trips = []
+    for stops in split_trips(tour, volumes, capacity):
+        trip = np.concatenate([[0], stops, [0]])
+        if capacity is not None:
+            trip = two_opt(trip, dist)
+        trips.append((trip[1:-1], tour_length(trip, dist)))
+    return trips
+
+
+def plan_routes(stops: Sequence[Stop], depot: Optional[Tuple[float, float]] = None,
+                capacity: Optional[float] = None, balance: bool = True,
+                tolerance: float = BALANCE_TOLERANCE) -> RoutePlan:
+    """Weekly collection plan: stops spread over WORKDAYS, each day's
+    stops ordered by nearest neighbour + 2-opt from ``depot`` (default:
+    the stops' centroid) and split into truck trips of ``capacity`` kg.
+
+    Stops booked on a weekend day count as Monday. With ``balance`` off
+    every stop keeps its booked day.
+    """
+    start = time.perf_counter()
+    lat = np.array([stop.lat for stop in stops], dtype=np.float64)
+    lon = np.array([stop.lon for stop in stops], dtype=np.float64)
+    volumes = np.array([stop.volume for stop in stops], dtype=np.float64)
+    booked = np.array([WORKDAYS.index(stop.day) if stop.day in WORKDAYS else 0 for stop in stops], dtype=np.int64)
+    if depot is None and len(stops):
+        depot = (float(lat.mean()), float(lon.mean()))
+    days = balance_days(project(lat, lon), volumes, booked, tolerance) if balance and len(stops) else booked
+
+    plans = []
+    for index, day in enumerate(WORKDAYS):
+        members = np.flatnonzero(days == index)
+        plan = DayPlan(day)
+        if len(members):
+            trips = route_day(
+                np.concatenate([[depot[0]], lat[members]]),
+                np.concatenate([[depot[1]], lon[members]]),
+                np.concatenate([[0.0], volumes[members]]),
+                capacity,
+            )
+            for order, km in trips:
+                chosen = members[order - 1]
+                plan.trips.append(Trip(chosen.tolist(), float(volumes[chosen].sum()), km))
+        plans.append(plan)
+    return RoutePlan(
+        days=plans,
+        assigned=[WORKDAYS[day] for day in days],
+        moved=int((days != booked).sum()),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def expected_volume(totals, waste_type: str, frequency: str) -> float:
+    """kg one collection of ``waste_type`` should pick up, from the
+    average weekly weight logged in WasteAggregates ``totals``."""
+    if not totals.by_day:
+        return 0.0
+    days = (max(totals.by_day) - min(totals.by_day)).days + 1
+    weekly = totals.by_type.get(waste_type, 0.0) * 7 / max(days, 7)
+    return weekly * COLLECTION_WEEKS.get(frequency, 1)
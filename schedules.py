@@ -0,0 +1,204 @@
+import heapq
+import itertools
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from recurrence import Recurrence
+from state_backend import CachedCollection
+
+PENDING = "pending"
+COMPLETED = "completed"
+
+
+class Schedule:
+    """One collection schedule. Slotted, with its type, day, time and
+    frequency strings interned, so many schedules share one copy of each
+    value instead of carrying a dict apiece."""
+
+    __slots__ = ("id", "type", "day", "time", "frequency", "notes", "rule")
+
+    def __init__(self, id: int, type: str, day: str, time: str, frequency: str, notes: str = "", rule=None):
+        self.id = id
+        self.type = sys.intern(type)
+        self.day = sys.intern(day)
+        self.time = sys.intern(time)
+        self.frequency = sys.intern(frequency)
+        self.notes = notes
+        self.rule = rule
+
+    def __repr__(self) -> str:
+        return f"Schedule(id={self.id}, type={self.type!r}, day={self.day!r}, time={self.time!r}, frequency={self.frequency!r})"
+
+
+def schedule_record(schedule: Schedule, status: str) -> Dict[str, Any]:
+    """``schedule`` as a JSON-ready record for a state backend."""
+    return {
+        "type": schedule.type, "day": schedule.day, "time": schedule.time, "frequency": schedule.frequency,
+        "notes": schedule.notes, "status": status,
+        "rule": schedule.rule.to_record() if schedule.rule is not None else None,
+    }
+
+
+def schedule_from_record(schedule_id: int, record: Dict[str, Any]) -> Schedule:
+    rule = Recurrence.from_record(record["rule"]) if record["rule"] is not None else None
+    return Schedule(schedule_id, record["type"], record["day"], record["time"], record["frequency"],
+                    record["notes"], rule)
+
+
+class ScheduleStore:
+    """Collection schedules indexed by id and by status.
+
+    Ids come from a monotonic counter and are never reused, so deleting a
+    schedule cannot make a later one collide with it. Each status index is
+    an insertion-ordered dict used as an ordered set, which makes lookups,
+    completes and deletes O(1) and keeps listings in creation order.
+
+    Schedules carrying a ``rule`` (a recurrence.Recurrence) also sit in a
+    min-heap keyed on their next due time. Completed and deleted schedules
+    are dropped from it lazily, and occurrences that have passed are rolled
+    forward when they surface, so ``upcoming`` costs O(k log n).
+
+    With ``shared`` (a state_backend.CachedCollection) every write goes to
+    the state backend, which also hands out the ids, and writes made by
+    other processes are folded into the indexes as the collection syncs.
+
+    ``version`` changes with every add, complete and delete, and a lock
+    makes the store safe to share between sessions.
+    """
+
+    def __init__(self, shared: Optional[CachedCollection] = None):
+        self._next_id = 1
+        self._by_id: Dict[int, Schedule] = {}
+        self._by_status: Dict[str, Dict[int, None]] = {PENDING: {}, COMPLETED: {}}
+        self._due: List[Tuple[datetime, int]] = []
+        self._version = 0
+        self._shared = shared
+        if shared is None:
+            self._lock = threading.RLock()
+            return
+        # Syncs call back into the store holding the collection's lock, so
+        # the store uses that lock too rather than nesting two
+        self._lock = shared.lock
+        with self._lock:
+            records = shared.records()
+            shared.on_change = self._apply
+            self._apply(dict(sorted(records.items())))
+
+    @property
+    def version(self) -> int:
+        self._sync()
+        return self._version
+
+    def _sync(self):
+        if self._shared is not None:
+            self._shared.sync()
+
+    def _index(self, schedule: Schedule, status: str):
+        known = schedule.id in self._by_id
+        self._by_id[schedule.id] = schedule
+        if schedule.id not in self._by_status[status]:
+            self._by_status[PENDING if status == COMPLETED else COMPLETED].pop(schedule.id, None)
+            self._by_status[status][schedule.id] = None
+        if not known and status == PENDING and schedule.rule is not None:
+            due = schedule.rule.next_after(datetime.now())
+            heapq.heappush(self._due, (due, schedule.id))
+        self._version += 1
+
+    def _unindex(self, schedule_id: int) -> bool:
+        if self._by_id.pop(schedule_id, None) is None:
+            return False
+        self._by_status[PENDING].pop(schedule_id, None)
+        self._by_status[COMPLETED].pop(schedule_id, None)
+        self._version += 1
+        return True
+
+    def _apply(self, changes: Dict[int, Optional[Dict[str, Any]]]):
+        for schedule_id, record in changes.items():
+            if record is None:
+                self._unindex(schedule_id)
+            else:
+                self._index(schedule_from_record(schedule_id, record), record["status"])
+
+    def add(self, schedule: Dict[str, Any]) -> Schedule:
+        with self._lock:
+            schedule = Schedule(0, **schedule)
+            if self._shared is None:
+                schedule.id = self._next_id
+                self._next_id += 1
+            else:
+                schedule.id = self._shared.put(schedule_record(schedule, PENDING))
+            self._index(schedule, PENDING)
+        return schedule
+
+    def get(self, schedule_id: int) -> Optional[Schedule]:
+        self._sync()
+        return self._by_id.get(schedule_id)
+
+    def status(self, schedule_id: int) -> Optional[str]:
+        self._sync()
+        if schedule_id in self._by_status[COMPLETED]:
+            return COMPLETED
+        if schedule_id in self._by_status[PENDING]:
+            return PENDING
+        return None
+
+    def complete(self, schedule_id: int) -> bool:
+        with self._lock:
+            self._sync()
+            if schedule_id not in self._by_status[PENDING]:
+                return False
+            schedule = self._by_id[schedule_id]
+            if self._shared is not None:
+                self._shared.put(schedule_record(schedule, COMPLETED), schedule_id)
+            self._index(schedule, COMPLETED)
+        return True
+
+    def delete(self, schedule_id: int) -> bool:
+        with self._lock:
+            self._sync()
+            if schedule_id not in self._by_id:
+                return False
+            if self._shared is not None:
+                self._shared.delete(schedule_id)
+            return self._unindex(schedule_id)
+
+    def count(self, status: Optional[str] = None) -> int:
+        self._sync()
+        return len(self._by_id) if status is None else len(self._by_status[status])
+
+    def page(self, status: str, page: int, per_page: int) -> List[Schedule]:
+        """Schedules with ``status`` on the zero-based ``page``."""
+        with self._lock:
+            self._sync()
+            ids = itertools.islice(self._by_status[status], page * per_page, (page + 1) * per_page)
+            return [self._by_id[schedule_id] for schedule_id in ids]
+
+    def upcoming(self, n: int, now: Optional[datetime] = None) -> List[Tuple[datetime, Schedule]]:
+        """The ``n`` pending schedules due soonest at or after ``now``,
+        as (due, schedule) pairs in due order."""
+        now = now or datetime.now()
+        found = []
+        with self._lock:
+            self._sync()
+            while self._due and len(found) < n:
+                due, schedule_id = heapq.heappop(self._due)
+                if schedule_id not in self._by_status[PENDING]:
+                    continue
+                schedule = self._by_id[schedule_id]
+                if due < now:
+                    heapq.heappush(self._due, (schedule.rule.next_after(now), schedule_id))
+                    continue
+                found.append((due, schedule))
+            for due, schedule in found:
+                heapq.heappush(self._due, (due, schedule.id))
+        return found
+
+    def __iter__(self):
+        self._sync()
+        return iter(list(self._by_id.values()))
+
+    def __len__(self) -> int:
+        self._sync()
+        return len(self._by_id)
@@ -0,0 +1,117 @@
+import collections
+import functools
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from response_cache import CachedResponse, record_stream
+
+# Question words that carry no meaning about the item being asked about
+STOPWORDS = frozenset(
+    "a an and are can could do does for how i in is it me my of on or should the to what where "
+    "which with you your be this that there".split()
+)
+# Phrasing that does not change what is being asked about
+FILLER_WORDS = frozenset("tip idea way best please help advice properly".split())
+_WORD = re.compile(r"[a-z0-9]+")
+_NEGATION = re.compile(r"\b(?:not|no|never|without|cannot)\b|n't\b")
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ables", "able", "ing", "ies", "es", "ed", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def content_words(text: str) -> List[str]:
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def meaning_key(text: str) -> Tuple[frozenset, bool]:
+    """What a question is about: its content words, loosely stemmed
+    ("recycle" / "recyclable" agree) and without filler such as "tips",
+    and whether it is negated. Numbers are content words, so quantities
+    must agree too."""
+    words = frozenset(word.rstrip("e") for word in content_words(text)) - FILLER_WORDS
+    return words, bool(_NEGATION.search(text.lower()))
+
+
+class SemanticCache:
+    """Bounded LRU cache of replies looked up by meaning_key.
+
+    Paraphrases that keep a question's content words ("can I recycle X" /
+    "is X recyclable") share a key, so a lookup is one dict access
+    whatever the size of the cache. Questions about a different item
+    ("paint cans" for "cans"), with a different quantity or negated on one
+    side only get a key of their own and never share a reply.
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: "collections.OrderedDict[Tuple[frozenset, bool], str]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.lookup_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, prompt: str) -> Optional[str]:
+        start = time.perf_counter()
+        key = meaning_key(prompt)
+        with self._lock:
+            reply = self._entries.get(key)
+            if reply is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            self.lookup_seconds += time.perf_counter() - start
+            return reply
+
+    def put(self, prompt: str, reply: str):
+        key = meaning_key(prompt)
+        with self._lock:
+            self._entries[key] = reply
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "avg_lookup_ms": 1000 * self.lookup_seconds / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+class SemanticCachedModel:
+    """Serves near-duplicate plain-text prompts from a SemanticCache and
+    forwards everything else to ``model``, recording new replies."""
+
+    def __init__(self, model, cache: SemanticCache):
+        self.model = model
+        self.semantic_cache = cache
+        self.model_name = getattr(model, "model_name", type(model).__name__)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        if not isinstance(prompt, str) or kwargs:
+            return self.model.generate_content(prompt, stream=stream, **kwargs)
+        text = self.semantic_cache.get(prompt)
+        if text is not None:
+            return CachedResponse(text)
+        response = self.model.generate_content(prompt, stream=stream)
+        if stream:
+            return record_stream(response, functools.partial(self.semantic_cache.put, prompt))
+        if response.text:
+            self.semantic_cache.put(prompt, response.text)
+        return response
@@ -0,0 +1,227 @@
+import functools
+import glob
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from goals import GoalStore
+from schedules import ScheduleStore, PENDING
+from state_backend import MAX_STALENESS_SECONDS, CachedCollection, StateBackend
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_SITE = "Main"
+
+
+def site_slug(name: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", name.strip().lower()).strip("-")
+    if not slug:
+        raise ValueError(f"Invalid site name: {name!r}")
+    return slug
+
+
+def site_path(backend: str, path: Optional[str], site: str, default_site: str = DEFAULT_SITE) -> Optional[str]:
+    """Where ``site``'s log lives. The default site keeps the configured
+    path, so a log written before sites existed stays where it was; other
+    sites get ``waste_log.<slug>.db`` (SQLite) or ``waste_log/sites/<slug>/``
+    (Parquet)."""
+    if site_slug(site) == site_slug(default_site) or backend == "memory":
+        return path
+    if backend == "sqlite":
+        root, ext = os.path.splitext(path or "waste_log.db")
+        return f"{root}.{site_slug(site)}{ext}"
+    if backend == "parquet":
+        return os.path.join(path or "waste_log", "sites", site_slug(site))
+    return path
+
+
+def stored_sites(backend: str, path: Optional[str]) -> List[str]:
+    """Slugs of the non-default sites that already have a log on disk."""
+    if backend == "sqlite":
+        root, ext = os.path.splitext(path or "waste_log.db")
+        files = glob.glob(f"{glob.escape(root)}.*{ext}")
+        return sorted(file[len(root) + 1:len(file) - len(ext)] for file in files)
+    if backend == "parquet":
+        sites_dir = os.path.join(path or "waste_log", "sites")
+        return sorted(os.listdir(sites_dir)) if os.path.isdir(sites_dir) else []
+    return []
+
+
+class Site:
+    """One facility's waste log, collection schedules and goals, and its
+    (latitude, longitude) when known.
+
+    The log is opened on first access, so pages that only show schedules
+    never load it (nor pandas).
+    """
+
+    def __init__(self, name: str, open_waste: Callable[[], Any], location: Optional[Tuple[float, float]] = None,
+                 schedules: Optional[ScheduleStore] = None, goals: Optional[GoalStore] = None):
+        self.name = name
+        self.location = location
+        self.schedules = ScheduleStore() if schedules is None else schedules
+        self.goals = GoalStore() if goals is None else goals
+        self._open_waste = open_waste
+        self._waste = None
+        self._lock = threading.Lock()
+
+    @property
+    def waste(self):
+        with self._lock:
+            if self._waste is None:
+                self._waste = self._open_waste()
+            return self._waste
+
+
+class SiteRegistry:
+    """Every site of a deployment, each with its own partition of the data.
+
+    Stores are opened on first use, so a request for one site never reads
+    another site's log. ``rollup`` builds the cross-site view from each
+    site's running aggregates and caches every site's row on its store
+    version, so only sites written to since the last call are recomputed.
+
+    With a ``state`` backend the site list itself is kept in its "sites"
+    collection, with locations set from the UI, so both survive restarts
+    and show up in every process. Each site's schedules and goals live in its
+    ``schedules:<slug>`` and ``goals:<slug>`` collections, and every store
+    (SQLite waste logs too) picks up other processes' writes within
+    ``max_staleness`` seconds. Parquet logs are only seen by the process
+    that writes them, so they cannot be combined with a state backend.
+    """
+
+    def __init__(self, backend: str = "memory", path: Optional[str] = None,
+                 names: Optional[List[str]] = None, default: str = DEFAULT_SITE,
+                 locations: Optional[Dict[str, List[float]]] = None,
+                 state: Optional[StateBackend] = None, max_staleness: float = MAX_STALENESS_SECONDS):
+        if backend == "parquet" and state is not None:
+            raise ValueError("The parquet waste store cannot be shared between processes; use sqlite with a state backend")
+        self.backend = backend
+        self.path = path
+        self.default = default
+        self.state = state
+        self.max_staleness = max_staleness
+        self._names: Dict[str, str] = {}
+        self._sites: Dict[str, Site] = {}
+        self._rows: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        # Slug -> id of the site's record in the "sites" collection
+        self._record_ids: Dict[str, int] = {}
+        self._locations: Dict[str, Tuple[float, float]] = {
+            site_slug(name): (float(lat), float(lon)) for name, (lat, lon) in (locations or {}).items()
+        }
+        self._shared = None
+        if state is None:
+            self._lock = threading.RLock()
+        else:
+            # Syncs call back into the registry under the collection's lock
+            self._shared = CachedCollection(state, "sites", max_staleness)
+            self._lock = self._shared.lock
+        with self._lock:
+            for name in [default, *(names or [])]:
+                self._names.setdefault(site_slug(name), name)
+            # Stored names win over slugs of logs found on disk
+            if self._shared is not None:
+                self._apply(dict(sorted(self._shared.records().items())))
+                self._shared.on_change = self._apply
+            for slug in stored_sites(backend, path):
+                self._names.setdefault(slug, slug)
+
+    def _apply(self, changes: Dict[int, Optional[Dict[str, Any]]]):
+        for record_id, record in changes.items():
+            if record is None:
+                continue
+            # Two processes adding the same site at once both store it;
+            # every process keeps the older record
+            known = self._record_ids.get(record["slug"])
+            if known is not None and known < record_id:
+                continue
+            self._record_ids[record["slug"]] = record_id
+            self._names[record["slug"]] = record["name"]
+            if record.get("location") is not None:
+                location = self._locations[record["slug"]] = tuple(record["location"])
+                if record["slug"] in self._sites:
+                    self._sites[record["slug"]].location = location
+
+    def _store(self, slug: str):
+        """Writes the site's name and location to the "sites" collection."""
+        location = self._locations.get(slug)
+        record = {"name": self._names[slug], "slug": slug, "location": list(location) if location else None}
+        self._record_ids[slug] = self._shared.put(record, self._record_ids.get(slug))
+
+    def _sync(self):
+        if self._shared is not None:
+            self._shared.sync()
+
+    def names(self) -> List[str]:
+        self._sync()
+        return list(self._names.values())
+
+    def add(self, name: str) -> str:
+        slug = site_slug(name)
+        with self._lock:
+            self._sync()
+            if slug in self._names and (self._shared is None or slug in self._record_ids):
+                return self._names[slug]
+            name = self._names.setdefault(slug, name.strip())
+            if self._shared is not None:
+                self._store(slug)
+            return name
+
+    def site(self, name: str) -> Site:
+        slug = site_slug(name)
+        with self._lock:
+            self._sync()
+            if slug not in self._names:
+                raise KeyError(f"Unknown site: {name}")
+            if slug not in self._sites:
+                name = self._names[slug]
+                schedules = goals = None
+                if self.state is not None:
+                    schedules = ScheduleStore(CachedCollection(self.state, f"schedules:{slug}", self.max_staleness))
+                    goals = GoalStore(CachedCollection(self.state, f"goals:{slug}", self.max_staleness))
+                self._sites[slug] = Site(
+                    name, functools.partial(self._open_waste, name), self._locations.get(slug), schedules, goals
+                )
+            return self._sites[slug]
+
+    def set_location(self, name: str, lat: float, lon: float):
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"Invalid coordinates: {lat}, {lon}")
+        site = self.site(name)
+        with self._lock:
+            self._locations[site_slug(name)] = site.location = (float(lat), float(lon))
+            if self._shared is not None:
+                self._store(site_slug(name))
+
+    def _open_waste(self, name: str):
+        from waste_store import open_store
+        options = {"refresh_seconds": self.max_staleness} if self.backend == "sqlite" else {}
+        return open_store(self.backend, site_path(self.backend, self.path, name, self.default), **options)
+
+    def _row(self, site: Site) -> Dict[str, Any]:
+        from waste_store import WASTE_TYPES
+        key = (site.waste.version, site.schedules.version)
+        cached = self._rows.get(site.name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        totals = site.waste.aggregates_snapshot()
+        row = {
+            "site": site.name,
+            "entries": totals.count,
+            "total_kg": totals.total,
+            **{waste_type: totals.by_type.get(waste_type, 0.0) for waste_type in WASTE_TYPES},
+            "pending_collections": site.schedules.count(PENDING),
+        }
+        self._rows[site.name] = (key, row)
+        return row
+
+    def rollup(self) -> "pd.DataFrame":
+        """One row per site plus an "All sites" total row."""
+        import pandas as pd
+        sites = [self.site(name) for name in self.names()]
+        frame = pd.DataFrame([self._row(site) for site in sites])
+        total = frame.drop(columns="site").sum().to_dict()
+        frame = pd.concat([frame, pd.DataFrame([{"site": "All sites", **total}])], ignore_index=True)
+        return frame.astype({"entries": "int64", "pending_collections": "int64"})
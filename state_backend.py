@@ -0,0 +1,439 @@
+"""Shared, durable app state for running several app processes at once.
+
+State is kept in named collections of JSON records with integer ids. Each
+collection has a version that every write bumps, and a change log saying
+which record each version touched, so a process can catch up on what the
+others wrote by fetching only the changed records.
+
+Two backends implement it: SQLite in WAL mode (processes on one host) and
+Redis, spoken to directly over RESP so no client library is needed
+(``fake_redis.RespServer`` stands in for a real server in benchmarks).
+CachedCollection puts a write-through in-process cache in front of either.
+"""
+import json
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Changes kept per collection; a reader further behind reloads it whole
+CHANGELOG_LIMIT = 10000
+# Longest a cached read may lag writes made by other processes
+MAX_STALENESS_SECONDS = 1.0
+
+Record = Dict[str, Any]
+
+
+class StateBackend:
+    """Collections of JSON records with versions and a change log."""
+
+    def version(self, collection: str) -> int:
+        raise NotImplementedError
+
+    def put(self, collection: str, record: Record, record_id: Optional[int] = None) -> Tuple[int, int]:
+        """Stores ``record`` under ``record_id`` (a new id when None);
+        returns (record id, new version)."""
+        raise NotImplementedError
+
+    def delete(self, collection: str, record_id: int) -> int:
+        """Removes a record; returns the new version."""
+        raise NotImplementedError
+
+    def drop(self, collection: str):
+        """Removes a collection with its version and change log. Meant for
+        collections no CachedCollection follows, which would miss it."""
+        raise NotImplementedError
+
+    def load(self, collection: str) -> Tuple[int, Dict[int, Record]]:
+        """(version, every record) as of one consistent moment."""
+        raise NotImplementedError
+
+    def changes(self, collection: str, since: int) -> Optional[Tuple[int, Dict[int, Optional[Record]]]]:
+        """(version, records changed after version ``since``, None for the
+        deleted ones), or None when the change log no longer reaches back
+        that far."""
+        raise NotImplementedError
+
+
+class SQLiteStateBackend(StateBackend):
+    """Records in one SQLite file in WAL mode, so readers never block the
+    writer. Writes take the database's write lock (BEGIN IMMEDIATE) and
+    commit the record, the version bump and the change-log entry at once."""
+
+    def __init__(self, path: str = "waste_state.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS records (collection TEXT NOT NULL, id INTEGER NOT NULL, "
+            "data TEXT NOT NULL, PRIMARY KEY (collection, id))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS versions (collection TEXT PRIMARY KEY, "
+            "version INTEGER NOT NULL, next_id INTEGER NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS changes (collection TEXT NOT NULL, version INTEGER NOT NULL, "
+            "record_id INTEGER NOT NULL, PRIMARY KEY (collection, version))"
+        )
+
+    def version(self, collection: str) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT version FROM versions WHERE collection = ?", (collection,)).fetchone()
+        return row[0] if row else 0
+
+    def _write(self, collection: str, record_id: Optional[int], data: Optional[str]) -> Tuple[int, int]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("INSERT OR IGNORE INTO versions VALUES (?, 0, 1)", (collection,))
+                version, next_id = self._db.execute(
+                    "SELECT version, next_id FROM versions WHERE collection = ?", (collection,)
+                ).fetchone()
+                if record_id is None:
+                    record_id = next_id
+                    next_id += 1
+                if data is None:
+                    self._db.execute("DELETE FROM records WHERE collection = ? AND id = ?", (collection, record_id))
+                else:
+                    self._db.execute("INSERT OR REPLACE INTO records VALUES (?, ?, ?)", (collection, record_id, data))
+                version += 1
+                self._db.execute(
+                    "UPDATE versions SET version = ?, next_id = ? WHERE collection = ?", (version, next_id, collection)
+                )
+                self._db.execute("INSERT INTO changes VALUES (?, ?, ?)", (collection, version, record_id))
+                self._db.execute(
+                    "DELETE FROM changes WHERE collection = ? AND version <= ?", (collection, version - CHANGELOG_LIMIT)
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return record_id, version
+
+    def put(self, collection: str, record: Record, record_id: Optional[int] = None) -> Tuple[int, int]:
+        return self._write(collection, record_id, json.dumps(record))
+
+    def delete(self, collection: str, record_id: int) -> int:
+        return self._write(collection, record_id, None)[1]
+
+    def drop(self, collection: str):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for table in ("records", "versions", "changes"):
+                    self._db.execute(f"DELETE FROM {table} WHERE collection = ?", (collection,))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def load(self, collection: str) -> Tuple[int, Dict[int, Record]]:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                row = self._db.execute("SELECT version FROM versions WHERE collection = ?", (collection,)).fetchone()
+                rows = self._db.execute("SELECT id, data FROM records WHERE collection = ?", (collection,)).fetchall()
+            finally:
+                self._db.execute("COMMIT")
+        return (row[0] if row else 0), {record_id: json.loads(data) for record_id, data in rows}
+
+    def changes(self, collection: str, since: int) -> Optional[Tuple[int, Dict[int, Optional[Record]]]]:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                row = self._db.execute("SELECT version FROM versions WHERE collection = ?", (collection,)).fetchone()
+                version = row[0] if row else 0
+                ids = [record_id for (record_id,) in self._db.execute(
+                    "SELECT record_id FROM changes WHERE collection = ? AND version > ? ORDER BY version",
+                    (collection, since),
+                )]
+                if len(ids) < version - since:
+                    return None
+                unique = list(dict.fromkeys(ids))
+                found = dict(self._db.execute(
+                    f"SELECT id, data FROM records WHERE collection = ? AND id IN ({','.join('?' * len(unique))})",
+                    (collection, *unique),
+                ).fetchall()) if unique else {}
+            finally:
+                self._db.execute("COMMIT")
+        return version, {record_id: json.loads(found[record_id]) if record_id in found else None for record_id in unique}
+
+
+class RespError(Exception):
+    """An error reply from a Redis-protocol server."""
+
+
+class RespConnectionError(ConnectionError):
+    """The connection failed partway through a command, so whether a
+    write was applied is unknown."""
+
+
+class RespConnection:
+    """Minimal RESP2 client: one socket, commands sent as arrays of bulk
+    strings, replies parsed into str / int / list / None.
+
+    Any failure while sending or reading (a timeout, a dropped connection,
+    a reply it cannot parse) closes the socket, so the unread rest of a
+    reply can never be taken for the next command's; the next command
+    reconnects. Commands sent with ``retry`` (reads) are tried once more
+    on a fresh connection; others raise RespConnectionError.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        # Replies are small; don't let Nagle hold them back
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rb")
+        if self.db:
+            reply = self._send((("SELECT", self.db),))[0]
+            if isinstance(reply, RespError):
+                raise reply
+
+    @staticmethod
+    def _encode(*args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read(self):
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            return RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Connection closed by server")
+            return data[:-2].decode()
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply: {line!r}")
+
+    def _send(self, commands) -> List[Any]:
+        self._sock.sendall(b"".join(self._encode(*command) for command in commands))
+        return [self._read() for _ in commands]
+
+    def _close(self):
+        for handle in (self._file, self._sock):
+            if handle is not None:
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+        self._sock = self._file = None
+
+    def pipeline(self, *commands, retry: bool = False) -> List[Any]:
+        """Sends every command in one write and reads the replies in order."""
+        with self._lock:
+            for attempt in range(2 if retry else 1):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    replies = self._send(commands)
+                    break
+                except (OSError, ValueError) as e:
+                    # ConnectionError and socket timeouts are OSErrors
+                    self._close()
+                    if attempt or not retry:
+                        raise RespConnectionError(
+                            f"Lost connection to {self.host}:{self.port} during "
+                            f"{' '.join(str(command[0]) for command in commands)}: {str(e)}"
+                        ) from e
+        for reply in replies:
+            # EXEC returns each queued command's reply, errors included
+            for item in reply if isinstance(reply, list) else [reply]:
+                if isinstance(item, RespError):
+                    raise item
+        return replies
+
+    def execute(self, *args, retry: bool = False):
+        return self.pipeline(args, retry=retry)[0]
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+
+class RedisStateBackend(StateBackend):
+    """Collections in Redis: a hash of id -> JSON per collection, an INCR
+    counter for its version and one for ids, and a capped list of changed
+    ids whose last entry belongs to the current version. Writes run in
+    MULTI/EXEC so the three always move together. Reads are retried once
+    after a lost connection; writes are not, since they may have been
+    applied, and raise RespConnectionError instead."""
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0, prefix: str = "waste_ai"):
+        self.prefix = prefix
+        self._conn = RespConnection(host, port, db)
+
+    def _key(self, collection: str, suffix: str = "") -> str:
+        return f"{self.prefix}:{collection}{suffix}"
+
+    def version(self, collection: str) -> int:
+        return int(self._conn.execute("GET", self._key(collection, ":version"), retry=True) or 0)
+
+    def _write(self, collection: str, record_id: int, data: Optional[str]) -> int:
+        change = ("HSET", self._key(collection), record_id, data) if data is not None else ("HDEL", self._key(collection), record_id)
+        replies = self._conn.pipeline(
+            ("MULTI",),
+            change,
+            ("INCR", self._key(collection, ":version")),
+            ("RPUSH", self._key(collection, ":changes"), record_id),
+            ("LTRIM", self._key(collection, ":changes"), -CHANGELOG_LIMIT, -1),
+            ("EXEC",),
+        )
+        return int(replies[-1][1])
+
+    def put(self, collection: str, record: Record, record_id: Optional[int] = None) -> Tuple[int, int]:
+        if record_id is None:
+            record_id = int(self._conn.execute("INCR", self._key(collection, ":next_id")))
+        return record_id, self._write(collection, record_id, json.dumps(record))
+
+    def delete(self, collection: str, record_id: int) -> int:
+        return self._write(collection, record_id, None)
+
+    def drop(self, collection: str):
+        self._conn.execute("DEL", *(self._key(collection, suffix) for suffix in ("", ":version", ":next_id", ":changes")))
+
+    def load(self, collection: str) -> Tuple[int, Dict[int, Record]]:
+        replies = self._conn.pipeline(
+            ("MULTI",), ("GET", self._key(collection, ":version")), ("HGETALL", self._key(collection)), ("EXEC",),
+            retry=True,
+        )
+        version, fields = replies[-1]
+        return int(version or 0), {int(fields[i]): json.loads(fields[i + 1]) for i in range(0, len(fields), 2)}
+
+    def changes(self, collection: str, since: int) -> Optional[Tuple[int, Dict[int, Optional[Record]]]]:
+        version = self.version(collection)
+        if version == since:
+            return version, {}
+        if version - since > CHANGELOG_LIMIT:
+            return None
+        replies = self._conn.pipeline(
+            ("MULTI",),
+            ("GET", self._key(collection, ":version")),
+            ("LRANGE", self._key(collection, ":changes"), since - version, -1),
+            ("EXEC",),
+            retry=True,
+        )
+        latest, ids = replies[-1]
+        latest = int(latest or 0)
+        # A write may have landed between the two round trips
+        ids = ids[:len(ids) - (latest - version)] if latest > version else ids
+        if len(ids) < version - since:
+            return None
+        unique = list(dict.fromkeys(int(record_id) for record_id in ids))
+        values = self._conn.execute("HMGET", self._key(collection), *unique, retry=True) if unique else []
+        return version, {record_id: json.loads(value) if value is not None else None for record_id, value in zip(unique, values)}
+
+
+class CachedCollection:
+    """Write-through in-process cache of one collection.
+
+    Writes go to the backend and straight into the cache. Reads are served
+    from memory; at most every ``max_staleness`` seconds ``sync`` asks the
+    backend for its version and, if other processes have written since,
+    fetches only the records they changed. So a write becomes visible to
+    every process within ``max_staleness`` seconds of its next read.
+
+    ``on_change`` is called with each batch of changes pulled in that way,
+    under ``lock``, so an index built over the records can follow them;
+    take the same lock around anything that also writes.
+    """
+
+    def __init__(self, backend: StateBackend, name: str, max_staleness: float = MAX_STALENESS_SECONDS,
+                 on_change: Optional[Callable[[Dict[int, Optional[Record]]], None]] = None):
+        self.backend = backend
+        self.name = name
+        self.max_staleness = max_staleness
+        self.on_change = on_change
+        self.lock = threading.RLock()
+        self.version, self._records = backend.load(name)
+        self._checked = time.monotonic()
+
+    def sync(self, force: bool = False) -> Dict[int, Optional[Record]]:
+        """Brings the cache up to date if it may be stale; returns the
+        records that changed (None for deleted ones)."""
+        with self.lock:
+            now = time.monotonic()
+            if not force and now - self._checked < self.max_staleness:
+                return {}
+            self._checked = now
+            if self.backend.version(self.name) == self.version:
+                return {}
+            result = self.backend.changes(self.name, self.version)
+            if result is None:
+                version, records = self.backend.load(self.name)
+                changed = {record_id: records.get(record_id) for record_id in {*self._records, *records}}
+            else:
+                version, changed = result
+            for record_id, record in changed.items():
+                if record is None:
+                    self._records.pop(record_id, None)
+                else:
+                    self._records[record_id] = record
+            self.version = version
+            if changed and self.on_change is not None:
+                self.on_change(changed)
+            return changed
+
+    def records(self) -> Dict[int, Record]:
+        """Every record by id; treat it as read-only."""
+        self.sync()
+        return self._records
+
+    def put(self, record: Record, record_id: Optional[int] = None) -> int:
+        with self.lock:
+            record_id, version = self.backend.put(self.name, record, record_id)
+            self._records[record_id] = record
+            # Only skip ahead when no other process wrote in between;
+            # otherwise the next sync fetches their changes (and this one)
+            if version == self.version + 1:
+                self.version = version
+        return record_id
+
+    def delete(self, record_id: int) -> bool:
+        with self.lock:
+            if record_id not in self._records:
+                return False
+            version = self.backend.delete(self.name, record_id)
+            self._records.pop(record_id, None)
+            if version == self.version + 1:
+                self.version = version
+        return True
+
+
+def open_state_backend(backend: str = "memory", **options) -> Optional[StateBackend]:
+    """The configured backend, or None to keep state in process memory."""
+    if backend == "sqlite":
+        return SQLiteStateBackend(**options)
+    if backend == "redis":
+        return RedisStateBackend(**options)
+    if backend == "memory":
+        return None
+    raise ValueError(f"Unknown state backend: {backend}")
@@ -0,0 +1 @@
+"""Pages of the app, one module per entry in app.PAGES, each exposing ``render()``."""
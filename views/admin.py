@@ -0,0 +1,45 @@
+import streamlit as st
+
+from instrumentation import METRICS
+
+
+def _labels(labels) -> str:
+    return ", ".join(f"{key}={value}" for key, value in labels.items())
+
+
+def render_sidebar():
+    """Timings, token counts and cache hit rates of this process, with
+    Prometheus and JSON-lines downloads. Shared by every session."""
+    with st.sidebar.expander("🛠️ Instrumentation"):
+        rows = METRICS.summary()
+        if rows:
+            table = ["| timer | n | p50 ms | p95 ms | p99 ms |", "|---|---:|---:|---:|---:|"]
+            for row in rows:
+                name = f"{row['name']} ({_labels(row['labels'])})" if row['labels'] else row['name']
+                table.append(
+                    f"| {name} | {row['count']} | {row['p50'] * 1000:.1f} "
+                    f"| {row['p95'] * 1000:.1f} | {row['p99'] * 1000:.1f} |"
+                )
+            st.markdown("\n".join(table))
+        else:
+            st.caption("No timings recorded yet.")
+
+        for (name, labels), value in sorted(METRICS.counter_values().items()):
+            st.caption(f"{name} ({_labels(dict(labels))}): {value:,.0f}" if labels else f"{name}: {value:,.0f}")
+        for (name, labels), value in sorted(METRICS.gauges().items()):
+            st.caption(f"{name} ({_labels(dict(labels))}): {value:.0%}")
+
+        st.download_button(
+            "📤 Prometheus text",
+            data=METRICS.to_prometheus,
+            file_name="waste_ai_metrics.prom",
+            mime="text/plain",
+            key="metrics_prometheus",
+        )
+        st.download_button(
+            "📤 JSON lines",
+            data=METRICS.to_json_lines,
+            file_name="waste_ai_metrics.jsonl",
+            mime="application/x-ndjson",
+            key="metrics_jsonl",
+        )
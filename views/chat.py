@@ -0,0 +1,129 @@
+import streamlit as st
+
+from app_state import (
+    CHAT_RENDER_WINDOW, CONFIG_FILE, current_model, get_image_cache, has_api_key, load_config, save_messages,
+)
+from chat_history import build_contents, contents_tokens, estimate_tokens
+from chat_stream import stream_response, generate_response, format_timings
+from instrumentation import METRICS
+
+# Tokens of prior conversation sent with each chat prompt
+HISTORY_TOKEN_BUDGET = 2000
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:,.0f} KB"
+
+def identification_table(names, results, report) -> str:
+    """Markdown reply for a batch of identified photos, with what each
+    photo cost to send and how long it took."""
+    rows = ["| Photo | Item | Category | How to dispose of it | Uploaded → sent | Time |", "|---|---|---|---|---|---|"]
+    for name, result in zip(names, results):
+        if result is None:
+            rows.append(f"| {name} | Not identified | | | | |")
+            continue
+        sent = "cached" if result.cached else _kb(result.sent_bytes)
+        elapsed = f"{result.prepare_ms:.0f} ms" if result.cached else f"{result.prepare_ms + result.latency_ms:.0f} ms"
+        rows.append(
+            f"| {name} | {result.item} | {result.category or 'Unknown'} | {result.disposal} "
+            f"| {_kb(result.original_bytes)} → {sent} | {elapsed} |"
+        )
+    saved = 1 - report["sent_bytes"] / report["original_bytes"] if report["original_bytes"] else 0.0
+    rows.append(
+        f"\n📦 {_kb(report['original_bytes'])} uploaded, {_kb(report['sent_bytes'])} sent to the model "
+        f"({saved:.1%} smaller) · {report['api_calls']} API call(s) · {report['cached']} from cache "
+        f"· {report['seconds']:.2f}s"
+    )
+    return "\n".join(rows)
+
+def render_photo_mode(model):
+    with st.expander("📷 Identify waste from photos"):
+        photos = st.file_uploader(
+            "Photos of the items", type=["jpg", "jpeg", "png", "webp"], accept_multiple_files=True, key="photos"
+        )
+        if not photos or not st.button("🔍 Identify", key="identify_photos"):
+            return
+        if not has_api_key():
+            st.warning("Identifying photos needs the Gemini API, and no API key is configured.")
+            return
+        from image_classify import identify_images
+        options = dict(load_config(CONFIG_FILE).get('image_mode', {}))
+        cache = get_image_cache(**options.pop('cache', {}))
+        try:
+            with st.spinner(f"Identifying {len(photos)} photo(s)..."):
+                results, report = identify_images(model, [photo.getvalue() for photo in photos], cache, **options)
+        except Exception as e:
+            st.error(f"Could not identify the photos: {str(e)}")
+            return
+        names = [photo.name for photo in photos]
+        st.session_state.messages.append({"role": "user", "content": f"📷 Identify: {', '.join(names)}"})
+        st.session_state.messages.append({"role": "assistant", "content": identification_table(names, results, report)})
+        save_messages()
+
+def render():
+    st.title("💬 AI Waste Management Assistant")
+    
+    toggle_cols = st.columns(2)
+    with toggle_cols[0]:
+        stream = st.toggle("Stream responses", key="stream_responses")
+    with toggle_cols[1]:
+        remember = st.toggle("Remember conversation", key="remember_conversation")
+    model = current_model()
+    cache = getattr(model, "cache", None)
+    if cache is not None:
+        stats = cache.stats()
+        st.caption(f"🗄️ Response cache: {stats['hits']} hits · {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+    semantic_cache = getattr(model, "semantic_cache", None)
+    if semantic_cache is not None:
+        stats = semantic_cache.stats()
+        st.caption(f"🧭 Similar-question cache: {stats['hits']} hits · {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate, avg lookup {stats['avg_lookup_ms']:.2f} ms)")
+    if hasattr(model, "report"):
+        local = model.report()
+        st.caption(f"⚡ Answered locally: {local['local']} of {local['local'] + local['forwarded']} prompts ({local['hit_rate']:.0%}, avg {local['avg_local_ms']:.3f} ms)")
+
+    render_photo_mode(model)
+
+    # Only the most recent messages are painted on each rerun
+    messages = st.session_state.messages
+    hidden = max(0, len(messages) - st.session_state.chat_render_limit)
+    if hidden:
+        if st.button(f"⬆️ Show earlier messages ({hidden} hidden)"):
+            st.session_state.chat_render_limit += CHAT_RENDER_WINDOW
+            st.rerun()
+
+    # Display chat messages with improved styling
+    for message in messages[hidden:]:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+            if timings := format_timings(message):
+                st.caption(timings)
+    
+    # Enhanced chat input
+    if prompt := st.chat_input("Ask about waste management..."):
+        contents = build_contents(messages, prompt, HISTORY_TOKEN_BUDGET) if remember else prompt
+        st.session_state.messages.append({"role": "user", "content": prompt})
+        with st.chat_message("user"):
+            st.markdown(prompt)
+        metrics = {}
+        mode = "stream" if stream else "blocking"
+        with st.chat_message("assistant"):
+            try:
+                if stream:
+                    text = st.write_stream(stream_response(model, contents, metrics))
+                else:
+                    with st.spinner("Processing..."):
+                        text = generate_response(model, contents, metrics)
+                    st.markdown(text)
+            except Exception as e:
+                METRICS.inc("model_errors_total", mode=mode)
+                st.error(f"The assistant is unavailable right now: {str(e)}")
+                # Drop the unanswered prompt so the history keeps alternating turns
+                st.session_state.messages.pop()
+                return
+            METRICS.observe("model_call_seconds", metrics["latency"], mode=mode)
+            METRICS.observe("model_ttft_seconds", metrics["ttft"], mode=mode)
+            METRICS.inc("tokens_total", contents_tokens(contents), direction="prompt")
+            METRICS.inc("tokens_total", estimate_tokens(text), direction="completion")
+            message = {"role": "assistant", "content": text, **metrics}
+            st.caption(format_timings(message))
+            st.session_state.messages.append(message)
+            save_messages()
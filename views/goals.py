@@ -0,0 +1,64 @@
+import streamlit as st
+
+from app_state import current_store
+from goals import COMPLETED, GOAL_KINDS, OFF_TRACK, PERIODS, REDUCE
+from waste_store import WASTE_TYPES
+
+STATUS_STYLES = {COMPLETED: "success-alert", OFF_TRACK: "warning-alert"}
+
+def delete_goal(goal_id):
+    st.session_state.goals.delete(goal_id)
+    st.rerun()
+
+def render():
+    st.title("🎯 Goals")
+
+    with st.form("add_goal", clear_on_submit=True):
+        st.markdown("### 📝 Set New Goal")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            label = st.selectbox("Goal", list(GOAL_KINDS.values()))
+            waste_type = st.selectbox("Waste Type", WASTE_TYPES)
+        with col2:
+            target = st.number_input("Target (kg, or % for reductions)", min_value=0.1, value=10.0, step=0.5)
+            period = st.selectbox("Period", PERIODS)
+
+        if st.form_submit_button("Add Goal"):
+            kind = next(kind for kind, text in GOAL_KINDS.items() if text == label)
+            try:
+                if kind == REDUCE and target >= 100:
+                    raise ValueError("a reduction must be below 100%")
+                st.session_state.goals.add({
+                    "kind": kind,
+                    "waste_type": waste_type,
+                    "period": period,
+                    "target": target,
+                })
+                st.success("✅ Goal added!")
+            except ValueError as e:
+                st.error(f"Could not add goal: {str(e)}")
+
+    st.markdown("### 📈 Progress")
+    if not len(st.session_state.goals):
+        st.info("No goals yet. Set one above to start tracking your progress!")
+        return
+
+    # One evaluation covers every goal shown, even if another process adds
+    # or removes goals meanwhile
+    for result in st.session_state.goals.progress(current_store()).values():
+        goal = result.goal
+        per = "week" if goal.period == "Weekly" else "month"
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            st.markdown(f"""
+                <div class="{STATUS_STYLES.get(result.status, 'info-alert')}" style="margin-bottom: 0.5rem;">
+                    <strong>{goal.describe()}</strong> · {result.status}<br>
+                    This {per}: {result.current:.1f} kg of {result.limit:.1f} kg
+                    (last {per}: {result.previous:.1f} kg)
+                </div>
+            """, unsafe_allow_html=True)
+            st.progress(result.fraction)
+        with col2:
+            if st.button("🗑️ Delete", key=f"delete_goal_{goal.id}"):
+                delete_goal(goal.id)
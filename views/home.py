@@ -0,0 +1,179 @@
+import random
+
+import streamlit as st
+
+from app_state import current_store
+from charts import composition_figure, trend_figure
+from instrumentation import METRICS
+from schedules import PENDING
+from views.schedule import mark_schedule_complete
+
+# Upcoming collections listed on the dashboard
+UPCOMING_LIMIT = 5
+
+def get_random_fact():
+    """Returns a random fact from the FACTS list."""
+    # Define a list of facts
+    FACTS = [
+        "Recycling one aluminum can saves enough energy to run a TV for three hours.",
+        "Only 9% of all plastic waste ever produced has been recycled.",
+        "Composting food waste can reduce methane emissions from landfills.",
+        "Glass is 100% recyclable and can be recycled endlessly without loss of quality.",
+        "Around 1 million plastic bottles are bought every minute worldwide.",
+        "Recycling one ton of paper can save 17 trees and 7,000 gallons of water.",
+        "The decomposition of plastic can take up to 1,000 years in landfills.",
+        "Every year, 8 million metric tons of plastic enter the ocean.",
+        "Reducing food waste is one of the top ways to combat climate change.",
+        "Americans throw away 25% more trash during Thanksgiving to New Year's holiday period.",
+        "E-waste represents 2% of trash in landfills but 70% of toxic waste.",
+        "Every ton of recycled steel saves 2,500 pounds of iron ore and 1,400 pounds of coal.",
+        "Up to 60% of the waste in the average trash bin could be recycled.",
+        "Landfills are the third-largest source of methane emissions globally.",
+        "Plastic straws cannot be recycled and often end up harming marine life.",
+        "Recycling one ton of plastic saves about 2,000 gallons of gasoline.",
+        "By 2050, it’s estimated there will be more plastic in the ocean than fish (by weight).",
+        "Recycling one glass bottle saves enough energy to power a computer for 30 minutes.",
+        "Nearly 1/3 of the food produced globally goes to waste every year.",
+        "Upcycling—reusing items creatively—can extend the lifecycle of products and reduce waste.",
+        "If every American recycled just one-tenth of their newspapers, 25 million trees could be saved each year.",
+        "Textiles like clothing can take up to 200 years to decompose in landfills.",
+        "Battery recycling prevents heavy metals from contaminating soil and water."
+    ]
+    return random.choice(FACTS)
+
+@METRICS.timed("chart_render_seconds", chart="waste_overview")
+def render_waste_chart():
+    totals = current_store().aggregates_snapshot()
+    if totals.count:
+        composition_tab, daily_tab, weekly_tab = st.tabs(["Composition", "Daily Trend", "Weekly Trend"])
+        with composition_tab:
+            st.plotly_chart(composition_figure(totals, totals.version), use_container_width=True)
+        with daily_tab:
+            st.plotly_chart(trend_figure(totals, totals.version, "D"), use_container_width=True)
+        with weekly_tab:
+            st.plotly_chart(trend_figure(totals, totals.version, "W"), use_container_width=True)
+    else:
+        st.info("No waste data available. Start logging waste to see insights!")
+
+def render():
+    st.title("♻️ Smart Waste Management Dashboard")
+    st.caption(f"📍 {st.session_state.site}")
+    totals = current_store().aggregates_snapshot()
+    
+    # Overview Section with Enhanced Metrics
+    st.markdown("### 📊 Overview")
+    metrics_cols = st.columns(4)
+
+    with metrics_cols[0]:
+        st.markdown("""
+            <div class="metrics-card">
+                <div class="metric-value">📦 {:.1f}kg</div>
+                <div class="metric-label">Total Waste Collected</div>
+            </div>
+        """.format(totals.total),
+        unsafe_allow_html=True)
+
+    with metrics_cols[1]:
+        completed_goals = st.session_state.goals.completed(current_store())
+        st.markdown(f"""
+            <div class="metrics-card">
+                <div class="metric-value">🎯 {completed_goals}</div>
+                <div class="metric-label">Goals Completed</div>
+            </div>
+        """, unsafe_allow_html=True)
+    
+     # Add Random Fact Section
+    st.markdown("### 🌟 Did You Know?")
+    random_fact = get_random_fact()  # Fetch a new random fact
+    st.markdown(f"""
+        <div class="dashboard-card">
+            <h4 style="color: #1A3D37;">📚 Waste Management Fact</h4>
+            <div style="margin: 1rem 0;">
+                <div class="info-alert" style="color: #2C5282;">
+                    🌍 {random_fact}
+                </div>
+            </div>
+        </div>
+    """, unsafe_allow_html=True)
+
+    with metrics_cols[2]:
+        pending_schedules = st.session_state.schedules.count(PENDING)
+        st.markdown(f"""
+            <div class="metrics-card">
+                <div class="metric-value">📅 {pending_schedules}</div>
+                <div class="metric-label">Pending Schedules</div>
+            </div>
+        """, unsafe_allow_html=True)
+
+    with metrics_cols[3]:
+        total_recyclables = totals.by_type.get("Recyclables", 0.0)
+        st.markdown(f"""
+            <div class="metrics-card">
+                <div class="metric-value">♻️ {total_recyclables:.1f}kg</div>
+                <div class="metric-label">Recyclables Collected</div>
+            </div>
+        """, unsafe_allow_html=True)
+
+    # Add interactive chart
+    st.markdown("### 📈 Waste Analysis")
+    render_waste_chart()  # Ensure this function is defined and works
+
+    # Upcoming Collections (Non-completed schedules only)
+    st.markdown("### 📅 Upcoming Collections")
+    upcoming = st.session_state.schedules.upcoming(UPCOMING_LIMIT)
+
+    if upcoming:
+        with st.container():
+            for due, schedule in upcoming:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown(f"""
+                        <div class="info-alert">
+                            <strong>{schedule.type}</strong> · due {due.strftime('%a %d %b, %I:%M %p')}<br>
+                            {schedule.day} at {schedule.time} ({schedule.frequency})
+                        </div>
+                    """, unsafe_allow_html=True)
+                with col2:
+                    if st.button("✓ Complete", key=f"complete_{schedule.id}"):
+                        mark_schedule_complete(schedule.id)
+    else:
+        st.info("No upcoming collections scheduled. Great job staying on top of your tasks!")
+
+    # Recent Activity
+    st.markdown("### 🌟 Recent Activities")
+    if totals.count:
+        recent_logs = totals.recent(3)
+        for log in recent_logs:
+            st.markdown(f"""
+                <div class="success-alert">
+                    <strong>{log['date'].strftime('%Y-%m-%d')}</strong><br>
+                    {log['type']}: {log['weight']}kg
+                    {f"<br>{log['notes']}" if log['notes'] else ""}
+                </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("No recent activities logged.")
+
+    # Quick Actions
+    st.markdown("### 🚀 Quick Actions")
+    action_cols = st.columns(4)
+
+    with action_cols[0]:
+        if st.button("📝 Log New Waste"):
+            st.session_state.page = "tracker"
+            st.rerun()
+
+    with action_cols[1]:
+        if st.button("📅 View Schedule"):
+            st.session_state.page = "schedule"
+            st.rerun()
+
+    with action_cols[2]:
+        if st.button("🎯 Set New Goal"):
+            st.session_state.page = "goals"
+            st.rerun()
+
+    with action_cols[3]:
+        if st.button("💬 Get AI Help"):
+            st.session_state.page = "chat"
+            st.rerun()
@@ -0,0 +1,104 @@
+import pandas as pd
+import streamlit as st
+
+from app_state import CONFIG_FILE, load_config, site_registry
+from routing import Stop, expected_volume, plan_routes
+from schedules import PENDING
+
+# Stops named per trip before the list is cut short
+TRIP_STOPS_SHOWN = 30
+
+def collection_stops(registry):
+    """One stop per pending schedule of every site with a location, with
+    the volume its waste log says a collection picks up."""
+    stops, unplaced = [], []
+    for name in registry.names():
+        site = registry.site(name)
+        pending = site.schedules.page(PENDING, 0, site.schedules.count(PENDING))
+        if not pending:
+            continue
+        if site.location is None:
+            unplaced.append(name)
+            continue
+        totals = site.waste.aggregates_snapshot()
+        for schedule in pending:
+            stops.append(Stop(
+                name=f"{site.name} · {schedule.type}",
+                lat=site.location[0],
+                lon=site.location[1],
+                volume=expected_volume(totals, schedule.type, schedule.frequency),
+                day=schedule.day,
+                ref=(site.name, schedule.id),
+            ))
+    return stops, unplaced
+
+def render_location_form(registry):
+    with st.expander("📍 Site locations"):
+        # Not a form: the coordinates must follow the selected site
+        name = st.selectbox("Site", registry.names(), key="location_site")
+        location = registry.site(name).location
+        if location is None:
+            st.caption("No location saved for this site yet.")
+        lat, lon = location or (0.0, 0.0)
+        col1, col2 = st.columns(2)
+        with col1:
+            lat = st.number_input("Latitude", min_value=-90.0, max_value=90.0, value=lat, format="%.5f", key=f"lat_{name}")
+        with col2:
+            lon = st.number_input("Longitude", min_value=-180.0, max_value=180.0, value=lon, format="%.5f", key=f"lon_{name}")
+        if st.button("Save Location", key="save_location"):
+            try:
+                registry.set_location(name, lat, lon)
+                st.success(f"✅ Location of {name} saved")
+            except ValueError as e:
+                st.error(f"Could not save location: {str(e)}")
+
+def render():
+    st.title("🚚 Route Planner")
+    st.caption("Spreads pending collections over Monday–Friday and orders each day's stops into truck trips.")
+    registry = site_registry()
+    render_location_form(registry)
+
+    stops, unplaced = collection_stops(registry)
+    if unplaced:
+        st.warning(f"Sites without a location are left out: {', '.join(unplaced)}")
+    if not stops:
+        st.info("No collections to plan. Add schedules and site locations to get started!")
+        return
+
+    config = load_config(CONFIG_FILE).get('routing', {})
+    capacity = st.number_input("Truck capacity (kg)", min_value=1.0, value=float(config.get('truck_capacity_kg', 8000)), step=500.0)
+    balance = st.toggle("Balance load across days", value=True)
+    if st.button("🗺️ Plan Routes"):
+        with st.spinner(f"Planning {len(stops)} collections..."):
+            st.session_state.route_plan = (
+                plan_routes(stops, config.get('depot'), capacity, balance, config.get('balance_tolerance', 0.1)),
+                stops,
+            )
+
+    if "route_plan" not in st.session_state:
+        return
+    plan, planned = st.session_state.route_plan
+    st.caption(
+        f"{len(planned)} collections planned in {plan.seconds:.2f}s · "
+        f"{plan.moved} moved to another day to balance the load"
+    )
+    st.dataframe(
+        pd.DataFrame([
+            {"Day": day.day, "Stops": day.stops, "Load (kg)": round(day.load, 1),
+             "Trips": len(day.trips), "Distance (km)": round(day.distance_km, 1)}
+            for day in plan.days
+        ]),
+        use_container_width=True,
+        hide_index=True,
+    )
+    for day in plan.days:
+        if not day.trips:
+            continue
+        with st.expander(f"{day.day}: {len(day.trips)} trip(s), {day.distance_km:.1f} km"):
+            for number, trip in enumerate(day.trips, 1):
+                names = [planned[index].name for index in trip.stops[:TRIP_STOPS_SHOWN]]
+                more = len(trip.stops) - len(names)
+                st.markdown(
+                    f"**Trip {number}** · {trip.load:,.0f} kg · {trip.distance_km:.1f} km: "
+                    + " → ".join(names) + (f" → … {more} more" if more else "")
+                )
@@ -0,0 +1,115 @@
+from datetime import date, datetime
+
+import streamlit as st
+
+from recurrence import Recurrence
+from schedules import PENDING, COMPLETED
+
+# Schedules per page in each status list
+SCHEDULES_PER_PAGE = 20
+
+def delete_schedule(schedule_id):
+    st.session_state.schedules.delete(schedule_id)
+    st.rerun()  # Trigger a rerun after deletion
+
+def mark_schedule_complete(schedule_id):
+    st.session_state.schedules.complete(schedule_id)
+    st.rerun()  # Update the UI after marking complete
+
+def next_due_label(schedule) -> str:
+    if schedule.rule is None:
+        return ""
+    return f" · next {schedule.rule.next_after(datetime.now()).strftime('%a %d %b, %I:%M %p')}"
+
+def page_selector(total: int, key: str) -> int:
+    """Renders a page picker when ``total`` items span several pages and
+    returns the zero-based page to show."""
+    pages = max(1, -(-total // SCHEDULES_PER_PAGE))
+    if pages == 1:
+        return 0
+    # Deletes can shrink the page count below the page last selected
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=key)
+    return int(page) - 1
+
+def render():
+    st.title("📅 Collection Schedule")
+
+    # Add new collection schedule form
+    with st.form("add_schedule"):
+        st.markdown("### 📝 Add Collection Schedule")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            waste_type = st.selectbox("Waste Type", ["General", "Recyclables", "Organic", "Hazardous"])
+            collection_day = st.selectbox("Collection Day", ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"])
+        with col2:
+            frequency = st.selectbox("Frequency", ["Weekly", "Bi-weekly", "Monthly"])
+            time = st.time_input("Collection Time")
+
+        notes = st.text_area("Additional Notes", placeholder="Add any special instructions...")
+
+        if st.form_submit_button("Add Schedule"):
+            st.session_state.schedules.add({
+                "type": waste_type,
+                "day": collection_day,
+                "time": time.strftime("%I:%M %p"),
+                "frequency": frequency,
+                "notes": notes,
+                "rule": Recurrence.from_schedule(collection_day, time, frequency, date.today())
+            })
+            st.success(f"✅ Added {waste_type} collection for {collection_day}s at {time.strftime('%I:%M %p')} ({frequency})")
+            st.rerun()
+
+    schedules = st.session_state.schedules
+
+    # Display Non-Completed Schedules
+    st.markdown("### 📋 Non-Completed Schedules")
+    if schedules.count(PENDING):
+        page = page_selector(schedules.count(PENDING), "pending_page")
+        non_completed_schedules = schedules.page(PENDING, page, SCHEDULES_PER_PAGE)
+        for schedule in non_completed_schedules:
+            col1, col2, col3 = st.columns([3, 1, 1])
+            
+            with col1:
+                st.markdown(f"""
+                    <div class="info-alert" style="margin-bottom: 0.5rem;">
+                        <strong>{schedule.type}</strong>{next_due_label(schedule)}<br>
+                        {schedule.day} at {schedule.time} ({schedule.frequency})
+                        {f"<br><small>{schedule.notes}</small>" if schedule.notes else ""}
+                    </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                if st.button("✓ Complete", key=f"complete_schedule_{schedule.id}"):
+                    mark_schedule_complete(schedule.id)
+
+            with col3:
+                if st.button("🗑️ Delete", key=f"delete_schedule_{schedule.id}"):
+                    delete_schedule(schedule.id)
+    else:
+        st.info("No non-completed schedules. Great job staying on top of your collections!")
+
+    # Display Completed Schedules
+    st.markdown("### ✅ Completed Schedules")
+    if schedules.count(COMPLETED):
+        page = page_selector(schedules.count(COMPLETED), "completed_page")
+        completed_schedules = schedules.page(COMPLETED, page, SCHEDULES_PER_PAGE)
+        for schedule in completed_schedules:
+            col1, col3 = st.columns([3, 1])
+            
+            with col1:
+                st.markdown(f"""
+                    <div class="success-alert" style="margin-bottom: 0.5rem;">
+                        <strong>{schedule.type}</strong><br>
+                        {schedule.day} at {schedule.time} ({schedule.frequency})
+                        <br><small>Marked as completed</small>
+                    </div>
+                """, unsafe_allow_html=True)
+            
+            with col3:
+                if st.button("🗑️ Delete", key=f"delete_completed_{schedule.id}"):
+                    delete_schedule(schedule.id)
+    else:
+        st.info("No completed schedules yet.")
@@ -0,0 +1,22 @@
+import streamlit as st
+
+from app_state import site_registry
+from waste_store import WASTE_TYPES
+
+def render():
+    st.title("🌍 All Sites")
+    rollup = site_registry().rollup()
+    st.dataframe(
+        rollup.round(1),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "site": "Site",
+            "entries": "Entries",
+            "total_kg": st.column_config.NumberColumn("Total (kg)", format="%.1f"),
+            "pending_collections": "Pending Collections",
+        }
+    )
+    by_site = rollup.iloc[:-1].set_index("site")[WASTE_TYPES]
+    if by_site.to_numpy().any():
+        st.bar_chart(by_site, y_label="Weight (kg)")
@@ -0,0 +1,137 @@
+import functools
+
+import streamlit as st
+
+from analytics import GRANULARITIES
+from app_state import current_model, current_store, has_api_key
+from batch_classify import classify_items
+from bulk_io import import_file, export_file
+from charts import forecast_figure
+from instrumentation import METRICS
+from waste_store import WASTE_TYPES
+
+# Rows shown in the detailed log; the metrics still cover every row
+LOG_DISPLAY_ROWS = 1000
+
+def render():
+    st.title("📊 Waste Tracker")
+    
+    # Add new waste entry with improved form styling
+    with st.form("waste_entry", clear_on_submit=True):
+        st.markdown("### 📝 Log New Waste")
+        waste_type = st.selectbox("Waste Type", WASTE_TYPES)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            weight = st.number_input("Weight (kg)", min_value=0.1, step=0.1)
+        with col2:
+            date = st.date_input("Date")
+            
+        notes = st.text_area("Notes", placeholder="Add any additional details...")
+        
+        submit_col1, submit_col2 = st.columns([1, 4])
+        with submit_col1:
+            submitted = st.form_submit_button("Log Waste")
+            
+    if submitted:
+        try:
+            current_store().append([{
+                "date": date,
+                "type": waste_type,
+                "weight": weight,
+                "notes": notes
+            }])
+            st.success("✅ Waste logged successfully!")
+        except ValueError as e:
+            st.error(f"Could not log waste: {str(e)}")
+
+    render_bulk_io()
+    
+    # Display waste log with improved visualization
+    totals = current_store().aggregates_snapshot()
+    if totals.count:
+        st.markdown("### 📈 Waste Analysis")
+        
+        # Summary metrics
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Total Waste", f"{totals.total:.1f} kg")
+        with col2:
+            st.metric("Most Common Type", totals.most_common_type())
+        with col3:
+            st.metric("Number of Entries", totals.count)
+
+        render_forecast()
+        
+        # Display detailed log
+        st.markdown("### 📋 Detailed Log")
+        with METRICS.timer("dataframe_build_seconds", table="detailed_log"):
+            df = current_store().frame()
+            latest = df.nlargest(LOG_DISPLAY_ROWS, 'date')
+        if len(df) > LOG_DISPLAY_ROWS:
+            st.caption(f"Showing the {LOG_DISPLAY_ROWS:,} most recent of {len(df):,} entries")
+        st.dataframe(
+            latest,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"date": st.column_config.DateColumn("date")}
+        )
+
+def render_forecast():
+    store = current_store()
+    st.markdown("### 🔮 Trends & Forecast")
+    granularity = st.radio("Granularity", list(GRANULARITIES), horizontal=True, key="forecast_granularity")
+    series = store.trends()[granularity]
+    if series.forecast.empty:
+        st.info(f"Not enough data yet for a {granularity.lower()} forecast.")
+        return
+    with METRICS.timer("chart_render_seconds", chart="forecast"):
+        st.plotly_chart(forecast_figure(series, store.version, granularity), use_container_width=True)
+    forecast = series.forecast.assign(Total=series.forecast.sum(axis=1))
+    st.caption("Expected weight (kg) per period, for planning collection capacity")
+    st.dataframe(
+        forecast.round(1),
+        use_container_width=True,
+        column_config={"date": st.column_config.DateColumn("Period ending")}
+    )
+
+def render_bulk_io():
+    store = current_store()
+    with st.expander("📦 Bulk Import / Export"):
+        st.markdown("Upload a CSV or Parquet file with `date`, `type`, `weight` and optional `notes` columns.")
+        uploaded = st.file_uploader("Waste log file", type=["csv", "parquet"], key="bulk_upload")
+        ai_available = has_api_key()
+        use_ai = st.checkbox(
+            "🤖 Classify rows without a type from their notes", key="bulk_classify", disabled=not ai_available
+        ) and ai_available
+        if not ai_available:
+            st.caption("Classifying rows needs the Gemini API, and no API key is configured; rows without a type are rejected.")
+        if uploaded is not None and st.button("📥 Import", key="bulk_import"):
+            file_format = "parquet" if uploaded.name.lower().endswith(".parquet") else "csv"
+            classify = functools.partial(classify_items, current_model()) if use_ai else None
+            try:
+                with st.spinner("Importing..."):
+                    report = import_file(store, uploaded, file_format, classify=classify)
+            except (ValueError, TypeError) as e:
+                st.error(f"Import failed: {str(e)}")
+            else:
+                rate = report['rows'] / report['seconds'] if report['seconds'] else 0
+                st.success(f"✅ Imported {report['imported']:,} of {report['rows']:,} rows in {report['seconds']:.1f}s ({rate:,.0f} rows/s)")
+                classified = report['classified']
+                if classified['items']:
+                    st.info(
+                        f"🤖 Classified {classified['items']:,} items with {classified['api_calls']:,} API calls "
+                        f"({classified['items'] / max(classified['seconds'], 1e-9):,.1f} items/s)"
+                    )
+                if report['rejected']:
+                    st.warning(f"⚠️ {report['rejected']:,} rows rejected")
+                    st.dataframe(report['rejected_sample'], use_container_width=True, hide_index=True)
+
+        export_format = st.radio("Export format", ["csv", "parquet"], horizontal=True, key="bulk_export_format")
+        st.download_button(
+            "📤 Export Waste Log",
+            data=functools.partial(export_file, store, export_format),
+            file_name=f"waste_log.{export_format}",
+            mime="text/csv" if export_format == "csv" else "application/octet-stream",
+            disabled=not store.aggregates_snapshot().count,
+        )
@@ -0,0 +1,425 @@
+import glob
+import itertools
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from aggregates import WasteAggregates
+
+if TYPE_CHECKING:
+    from analytics import TrendEngine
+
+WASTE_TYPES = ["Recyclables", "Organic", "General", "Hazardous", "E-Waste"]
+COLUMNS = ["date", "type", "weight", "notes"]
+TYPE_DTYPE = pd.CategoricalDtype(WASTE_TYPES)
+DATE_DTYPE = "datetime64[ns]"
+# Rows the column buffers start with; they double whenever they fill up
+INITIAL_CAPACITY = 1024
+
+# Shared by every store so a version number identifies one state of one log
+_versions = itertools.count(1)
+# Parquet directory -> lock held while writing it, shared by every store
+# of the process opened on that directory
+_parquet_locks: Dict[str, threading.Lock] = {}
+_parquet_locks_guard = threading.Lock()
+
+
+def typed_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Coerces a frame to the waste-log schema: datetime date, categorical
+    type, float weight and string notes, in COLUMNS order."""
+    frame = frame.reindex(columns=COLUMNS)
+    return pd.DataFrame({
+        "date": pd.to_datetime(frame["date"]).astype(DATE_DTYPE),
+        "type": frame["type"].astype(TYPE_DTYPE),
+        "weight": frame["weight"].astype("float64"),
+        "notes": frame["notes"].fillna("").astype(str),
+    })
+
+
+def check_types(frame: pd.DataFrame):
+    """Raises ValueError when a row's type is missing or not in
+    WASTE_TYPES; typed_frame would silently turn it into NaN."""
+    types = frame["type"] if "type" in frame.columns else pd.Series(index=frame.index, dtype=object)
+    unknown = types[~types.isin(WASTE_TYPES)]
+    if len(unknown):
+        shown = ", ".join(sorted({"(missing)" if pd.isna(value) else str(value) for value in unknown})[:5])
+        raise ValueError(f"Unknown waste type in {len(unknown)} row(s): {shown}")
+
+
+def check_weights(frame: pd.DataFrame):
+    """Raises ValueError when a typed frame has a NaN, infinite or negative
+    weight, any of which would poison the running totals."""
+    weights = frame["weight"].to_numpy()
+    bad = ~(np.isfinite(weights) & (weights >= 0))
+    if bad.any():
+        shown = ", ".join(sorted({str(weight) for weight in weights[bad]})[:5])
+        raise ValueError(f"Invalid weight in {int(bad.sum())} row(s): {shown}")
+
+
+def entries_to_frame(entries: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    return typed_frame(pd.DataFrame(list(entries), columns=COLUMNS))
+
+
+def empty_frame() -> pd.DataFrame:
+    return entries_to_frame([])
+
+
+class WasteColumns:
+    """The log as growable NumPy columns: datetime64 dates, int8 type codes
+    into WASTE_TYPES, float64 weights and int32 note codes into a table of
+    interned notes (most entries share a few notes, or none).
+
+    Rows are only ever written past ``size``, so a frame over the first
+    ``size`` rows stays valid after later appends. ``frame`` builds it from
+    views of the buffers without copying them; a full buffer is copied
+    once into one twice its size.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.size = 0
+        self._dates = np.empty(capacity, DATE_DTYPE)
+        self._types = np.empty(capacity, np.int8)
+        self._weights = np.empty(capacity, np.float64)
+        self._notes = np.empty(capacity, np.int32)
+        self._note_values: List[str] = [""]
+        self._note_codes: Dict[str, int] = {"": 0}
+        self._note_index = None
+        self._frame = None
+
+    @property
+    def capacity(self) -> int:
+        return len(self._weights)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the buffers, spare capacity and note table included."""
+        buffers = self._dates.nbytes + self._types.nbytes + self._weights.nbytes + self._notes.nbytes
+        return buffers + sum(sys.getsizeof(note) for note in self._note_values) + sys.getsizeof(self._note_values)
+
+    def _grow(self, needed: int):
+        capacity = max(needed, 2 * self.capacity)
+        for name in ("_dates", "_types", "_weights", "_notes"):
+            old = getattr(self, name)
+            new = np.empty(capacity, old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def _note_codes_for(self, notes: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(notes)
+        lookup = np.empty(len(uniques), np.int32)
+        for index, note in enumerate(uniques):
+            code = self._note_codes.get(note)
+            if code is None:
+                code = self._note_codes[note] = len(self._note_values)
+                self._note_values.append(note)
+                self._note_index = None
+            lookup[index] = code
+        return lookup[codes]
+
+    def extend(self, frame: pd.DataFrame):
+        """Appends a frame already in the typed_frame schema."""
+        start, end = self.size, self.size + len(frame)
+        if end > self.capacity:
+            self._grow(end)
+        self._dates[start:end] = frame["date"].to_numpy()
+        self._types[start:end] = frame["type"].cat.codes.to_numpy()
+        self._weights[start:end] = frame["weight"].to_numpy()
+        self._notes[start:end] = self._note_codes_for(frame["notes"])
+        self.size = end
+
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None or len(self._frame) != self.size:
+            if self._note_index is None:
+                self._note_index = pd.Index(self._note_values, dtype=str)
+            size = self.size
+            self._frame = pd.DataFrame({
+                "date": self._dates[:size],
+                "type": pd.Categorical.from_codes(self._types[:size], dtype=TYPE_DTYPE, validate=False),
+                "weight": self._weights[:size],
+                "notes": pd.Categorical.from_codes(self._notes[:size], categories=self._note_index, validate=False),
+            }, copy=False)
+        return self._frame
+
+
+class WasteStore:
+    """Append-only log of waste entries with a typed DataFrame view.
+
+    Backends implement ``_write`` (persist new rows) and ``_read_all``
+    (load everything once, into WasteColumns). Appended rows go straight
+    into the columns as well, so a write never triggers a reload from the
+    backend. Backends shared with other processes also implement
+    ``_read_new``, returning rows written elsewhere since the last call;
+    reads fold them in the same way. ``version`` changes with every write
+    and is unique across the stores of a process, so anything derived from
+    the log can use it alone as a cache key.
+    """
+
+    def __init__(self):
+        self._version = next(_versions)
+        self._lock = threading.RLock()
+        self._columns = None
+        self._aggregates = None
+        self._snapshot = None
+        self._trends = None
+
+    def _write(self, frame: pd.DataFrame):
+        raise NotImplementedError
+
+    def _read_all(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def _read_new(self) -> Optional[pd.DataFrame]:
+        return None
+
+    @property
+    def version(self) -> int:
+        self.sync()
+        return self._version
+
+    def _fold(self, frame: pd.DataFrame):
+        # Rows written before the first read are picked up by _read_all
+        if self._columns is not None:
+            self._columns.extend(frame)
+        if self._aggregates is not None:
+            self._aggregates.add_frame(frame)
+        self._version = next(_versions)
+
+    def sync(self):
+        """Folds in rows other processes have appended since the last
+        check. Until the log is first read there is nothing to catch up."""
+        if self._columns is None:
+            return
+        with self._lock:
+            frame = self._read_new()
+            if frame is not None and not frame.empty:
+                self._fold(typed_frame(frame))
+
+    def append(self, entries: Iterable[Dict[str, Any]]) -> int:
+        return self.append_frame(pd.DataFrame(list(entries), columns=COLUMNS))
+
+    def append_frame(self, frame: pd.DataFrame) -> int:
+        check_types(frame)
+        return self._append_typed(typed_frame(frame))
+
+    def _append_typed(self, frame: pd.DataFrame) -> int:
+        check_weights(frame)
+        if frame.empty:
+            return 0
+        with self._lock:
+            self._write(frame)
+            self._fold(frame)
+        return len(frame)
+
+    def frame(self) -> pd.DataFrame:
+        """The whole log; treat it as read-only, it is shared between readers."""
+        with self._lock:
+            if self._columns is None:
+                self._columns = WasteColumns()
+                self._columns.extend(typed_frame(self._read_all()))
+            else:
+                self.sync()
+            return self._columns.frame()
+
+    def aggregates(self) -> WasteAggregates:
+        """Running totals over the log, built from the frame once and then
+        updated with each appended batch."""
+        with self._lock:
+            self.sync()
+            if self._aggregates is None:
+                self._aggregates = WasteAggregates.from_frame(self.frame())
+            return self._aggregates
+
+    def aggregates_snapshot(self) -> WasteAggregates:
+        """A copy of the running totals, safe to read while other sessions
+        append; its ``version`` is the store version it reflects. Copied
+        once per version and shared between readers, so treat it as
+        read-only."""
+        with self._lock:
+            totals = self.aggregates()
+            if self._snapshot is None or self._snapshot.version != self._version:
+                self._snapshot = totals.copy()
+                self._snapshot.version = self._version
+            return self._snapshot
+
+    def trends(self) -> "TrendEngine":
+        """Per-type daily, weekly and monthly series and forecasts, brought
+        up to date with the current version."""
+        from analytics import TrendEngine
+        with self._lock:
+            if self._trends is None:
+                self._trends = TrendEngine()
+            return self._trends.refresh(self.aggregates(), self.version)
+
+    def nbytes(self) -> int:
+        """Memory held by the log's columns."""
+        self.frame()
+        return self._columns.nbytes
+
+    def __len__(self) -> int:
+        return len(self.frame())
+
+
+class MemoryWasteStore(WasteStore):
+    """Keeps the log in process memory only; nothing survives a restart."""
+
+    def __init__(self):
+        super().__init__()
+        self._columns = WasteColumns()
+
+    def _write(self, frame: pd.DataFrame):
+        pass
+
+    def _read_all(self) -> pd.DataFrame:
+        return empty_frame()
+
+
+class SQLiteWasteStore(WasteStore):
+    """The log in one SQLite file in WAL mode, which several app processes
+    can share: every ``refresh_seconds`` at most a read checks for rows
+    past the last one this process has seen, and an append folds in any
+    it finds before inserting its own, so the columns keep the file's row
+    order."""
+
+    def __init__(self, path: str, refresh_seconds: float = 1.0):
+        super().__init__()
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self._last_id = 0
+        self._checked = time.monotonic()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS waste_log ("
+            "id INTEGER PRIMARY KEY, date TEXT NOT NULL, type TEXT NOT NULL, "
+            "weight REAL NOT NULL, notes TEXT NOT NULL DEFAULT '')"
+        )
+        self._db.commit()
+
+    def _select_after(self, last_id: int) -> pd.DataFrame:
+        frame = pd.read_sql_query(
+            "SELECT id, date, type, weight, notes FROM waste_log WHERE id > ? ORDER BY id", self._db, params=(last_id,)
+        )
+        if len(frame):
+            self._last_id = int(frame["id"].iloc[-1])
+        frame["date"] = pd.to_datetime(frame["date"], format="%Y-%m-%d")
+        return frame.drop(columns="id")
+
+    def _write(self, frame: pd.DataFrame):
+        rows = zip(
+            frame["date"].to_numpy().astype("datetime64[D]").astype(str).tolist(),
+            frame["type"].astype(str).tolist(),
+            frame["weight"].tolist(),
+            frame["notes"].tolist(),
+        )
+        # Holding the write lock, nobody can insert between the rows caught
+        # up on here and this batch
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            if self._columns is not None:
+                foreign = self._select_after(self._last_id)
+                if not foreign.empty:
+                    self._fold(typed_frame(foreign))
+            self._db.executemany("INSERT INTO waste_log (date, type, weight, notes) VALUES (?, ?, ?, ?)", rows)
+            if self._columns is not None:
+                self._last_id = self._db.execute("SELECT MAX(id) FROM waste_log").fetchone()[0]
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            raise
+        self._checked = time.monotonic()
+
+    def _read_all(self) -> pd.DataFrame:
+        self._checked = time.monotonic()
+        return self._select_after(0)
+
+    def _read_new(self) -> Optional[pd.DataFrame]:
+        now = time.monotonic()
+        if now - self._checked < self.refresh_seconds:
+            return None
+        self._checked = now
+        return self._select_after(self._last_id)
+
+
+class ParquetWasteStore(WasteStore):
+    """Append-only directory of Parquet part files, compacted in tiers.
+
+    Every append writes one new level-0 part. Whenever the newest
+    ``fanout`` parts share a level they are merged into one part a level
+    up, like carrying in a counter, so parts stay in log order, every row
+    is rewritten at most once per level (O(log n) times, not once per
+    compaction) and a log keeps at most ``fanout - 1`` parts per level.
+
+    Stores of one process opened on the same directory share a lock and
+    number parts from the directory, so they never reuse a name or merge
+    the same parts. Other processes are not coordinated with; a directory
+    belongs to one process.
+    """
+
+    def __init__(self, path: str, fanout: int = 8):
+        super().__init__()
+        self.path = path
+        self.fanout = fanout
+        os.makedirs(path, exist_ok=True)
+        with _parquet_locks_guard:
+            self._write_lock = _parquet_locks.setdefault(os.path.realpath(path), threading.Lock())
+
+    def _parts(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.path, "part-*.parquet")))
+
+    def _part_path(self, number: int, level: int = 0) -> str:
+        suffix = f".L{level}" if level else ""
+        return os.path.join(self.path, f"part-{number:08d}{suffix}.parquet")
+
+    @staticmethod
+    def _level(part: str) -> int:
+        # part-00000012.L2.parquet; parts without a level are level 0
+        name = os.path.basename(part)[:-len(".parquet")]
+        return int(name[15:]) if name[13:15] == ".L" else 0
+
+    def _next_part(self) -> int:
+        parts = self._parts()
+        return int(os.path.basename(parts[-1])[5:13]) + 1 if parts else 0
+
+    def _write(self, frame: pd.DataFrame):
+        with self._write_lock:
+            target = self._part_path(self._next_part())
+            frame.to_parquet(target + ".tmp", index=False)
+            os.replace(target + ".tmp", target)
+            self._compact()
+
+    def _compact(self):
+        while True:
+            tail = self._parts()[-self.fanout:]
+            level = self._level(tail[-1])
+            if len(tail) < self.fanout or any(self._level(part) != level for part in tail):
+                return
+            merged = pd.concat([pd.read_parquet(part) for part in tail], ignore_index=True)
+            target = self._part_path(self._next_part(), level + 1)
+            merged.to_parquet(target + ".tmp", index=False)
+            os.replace(target + ".tmp", target)
+            for part in tail:
+                os.remove(part)
+
+    def _read_all(self) -> pd.DataFrame:
+        # Not while a compaction is swapping parts
+        with self._write_lock:
+            parts = self._parts()
+            if not parts:
+                return empty_frame()
+            return pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+
+
+def open_store(backend: str = "memory", path: str = None, **options) -> WasteStore:
+    if backend == "sqlite":
+        return SQLiteWasteStore(path or "waste_log.db", **options)
+    if backend == "parquet":
+        return ParquetWasteStore(path or "waste_log", **options)
+    if backend == "memory":
+        return MemoryWasteStore()
+    raise ValueError(f"Unknown waste store backend: {backend}")